@@ -0,0 +1,227 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import colorsys
+import configparser
+from PyQt6.QtGui import QPalette, QColor
+
+# Loader for KDE color schemes like the bundled KritaRedesign.colors, so the
+# scheme can be switched to without installing it by hand. A scheme is parsed
+# into a QPalette (with the disabled/inactive color effects applied), once
+# per version of the file. The stylesheet colors are then taken from the
+# application palette like for any other scheme (see colorsFromPalette).
+
+SCHEME_NAME = "KritaRedesign.colors"
+
+# Loaded schemes by path: {'mtime', 'palette'}
+_schemes = {}
+
+# QPalette roles and the (color set, key) of the scheme they're taken from
+ROLES = {
+    QPalette.ColorRole.Window: ('Window', 'BackgroundNormal'),
+    QPalette.ColorRole.WindowText: ('Window', 'ForegroundNormal'),
+    QPalette.ColorRole.Base: ('View', 'BackgroundNormal'),
+    QPalette.ColorRole.AlternateBase: ('View', 'BackgroundAlternate'),
+    QPalette.ColorRole.Text: ('View', 'ForegroundNormal'),
+    QPalette.ColorRole.PlaceholderText: ('View', 'ForegroundInactive'),
+    QPalette.ColorRole.Button: ('Button', 'BackgroundNormal'),
+    QPalette.ColorRole.ButtonText: ('Button', 'ForegroundNormal'),
+    QPalette.ColorRole.Highlight: ('Selection', 'BackgroundNormal'),
+    QPalette.ColorRole.HighlightedText: ('Selection', 'ForegroundNormal'),
+    QPalette.ColorRole.ToolTipBase: ('Tooltip', 'BackgroundNormal'),
+    QPalette.ColorRole.ToolTipText: ('Tooltip', 'ForegroundNormal'),
+    QPalette.ColorRole.Link: ('View', 'ForegroundLink'),
+    QPalette.ColorRole.LinkVisited: ('View', 'ForegroundVisited'),
+    QPalette.ColorRole.BrightText: ('Window', 'ForegroundNegative')
+}
+
+# Background a foreground role is contrasted against by the color effects
+BACKGROUNDS = {
+    QPalette.ColorRole.WindowText: QPalette.ColorRole.Window,
+    QPalette.ColorRole.Text: QPalette.ColorRole.Base,
+    QPalette.ColorRole.PlaceholderText: QPalette.ColorRole.Base,
+    QPalette.ColorRole.ButtonText: QPalette.ColorRole.Button,
+    QPalette.ColorRole.HighlightedText: QPalette.ColorRole.Highlight,
+    QPalette.ColorRole.ToolTipText: QPalette.ColorRole.ToolTipBase,
+    QPalette.ColorRole.Link: QPalette.ColorRole.Base,
+    QPalette.ColorRole.LinkVisited: QPalette.ColorRole.Base,
+    QPalette.ColorRole.BrightText: QPalette.ColorRole.Window
+}
+
+
+def findScheme(directories):
+    """Path of the first KritaRedesign.colors found in the directories, or None."""
+    for directory in directories:
+        path = os.path.join(directory, SCHEME_NAME)
+        if os.path.isfile(path):
+            return path
+
+    return None
+
+
+def loadScheme(path):
+    """
+    Get the scheme at path as a dict with its 'palette' (QPalette). The file
+    is only parsed again once it's been modified."""
+    mtime = os.path.getmtime(path)
+    scheme = _schemes.get(path)
+
+    if not scheme or scheme['mtime'] != mtime:
+        scheme = {'mtime': mtime, 'palette': buildPalette(parseScheme(path))}
+        _schemes[path] = scheme
+
+    return scheme
+
+
+def parseScheme(path):
+    """Read a KDE color scheme into a dict of sections, keys kept case sensitive."""
+    parser = configparser.ConfigParser(interpolation=None, strict=False)
+    parser.optionxform = str
+    parser.read(path, encoding='utf-8')
+
+    return {name: dict(parser[name]) for name in parser.sections()}
+
+
+def colorsFromPalette(palette):
+    """The stylesheet color slots of variables for a QPalette, as hex strings without '#'."""
+    return {
+        'highlight': palette.color(QPalette.ColorRole.Highlight).name().split("#")[1],
+        'background': palette.color(QPalette.ColorRole.Window).name().split("#")[1],
+        'alternate': palette.color(QPalette.ColorRole.AlternateBase).name().split("#")[1],
+        'inactive_text_color': palette.color(QPalette.ColorRole.ToolTipText).name().split("#")[1],
+        'active_text_color': palette.color(QPalette.ColorRole.WindowText).name().split("#")[1]
+    }
+
+
+def buildPalette(scheme):
+    """
+    Build a QPalette from a parsed scheme. The Active group uses the scheme's
+    colors as they are, the Disabled and Inactive groups get its color effects."""
+    active = {}
+
+    for role, (colorSet, key) in ROLES.items():
+        value = scheme.get(f"Colors:{colorSet}", {}).get(key)
+        if value:
+            active[role] = parseColor(value)
+
+    # Bevel shades, derived from the button color like KDE does
+    if QPalette.ColorRole.Button in active:
+        button = active[QPalette.ColorRole.Button]
+        active[QPalette.ColorRole.Light] = lighten(button, 0.25)
+        active[QPalette.ColorRole.Midlight] = lighten(button, 0.1)
+        active[QPalette.ColorRole.Mid] = darken(button, 0.25)
+        active[QPalette.ColorRole.Dark] = darken(button, 0.5)
+        active[QPalette.ColorRole.Shadow] = darken(button, 0.85)
+
+    palette = QPalette()
+    groups = (
+        (QPalette.ColorGroup.Active, None),
+        (QPalette.ColorGroup.Inactive, scheme.get("ColorEffects:Inactive")),
+        (QPalette.ColorGroup.Disabled, scheme.get("ColorEffects:Disabled"))
+    )
+
+    for group, effects in groups:
+        for role, rgb in active.items():
+            if effects and effects.get('Enable', 'true') == 'true':
+                background = active.get(BACKGROUNDS.get(role))
+                rgb = applyEffects(rgb, effects, background)
+
+            palette.setColor(group, role, QColor(*rgb))
+
+    return palette
+
+
+def parseColor(value):
+    """'r,g,b[,a]' to an (r, g, b) tuple."""
+    return tuple(int(c) for c in value.split(',')[:3])
+
+
+""" COLOR EFFECTS """
+
+# Approximations of KColorUtils' color math, done in HLS rather than HCY
+
+def applyEffects(rgb, effects, background=None):
+    """
+    Apply a [ColorEffects:*] section to a color. Foreground colors are first
+    contrasted against their background, then every color gets the intensity
+    and color effects, like KColorScheme's state effects."""
+    amount = lambda key: float(effects.get(key, 0))
+    effect = lambda key: int(effects.get(key, 0))
+
+    if background:
+        if effect('ContrastEffect') == 1: # Fade
+            rgb = mix(rgb, background, amount('ContrastAmount'))
+        elif effect('ContrastEffect') == 2: # Tint
+            rgb = tint(rgb, background, amount('ContrastAmount'))
+
+    intensity = amount('IntensityAmount')
+    if effect('IntensityEffect') == 1: # Shade
+        rgb = shade(rgb, intensity)
+    elif effect('IntensityEffect') == 2: # Darken
+        rgb = darken(rgb, intensity)
+    elif effect('IntensityEffect') == 3: # Lighten
+        rgb = lighten(rgb, intensity)
+
+    color = parseColor(effects.get('Color', '0,0,0'))
+    if effect('ColorEffect') == 1: # Desaturate
+        rgb = darken(rgb, 0.0, 1.0 - amount('ColorAmount'))
+    elif effect('ColorEffect') == 2: # Fade
+        rgb = mix(rgb, color, amount('ColorAmount'))
+    elif effect('ColorEffect') == 3: # Tint
+        rgb = tint(rgb, color, amount('ColorAmount'))
+
+    return rgb
+
+
+def _toHls(rgb):
+    return colorsys.rgb_to_hls(*(c / 255 for c in rgb))
+
+
+def _fromHls(h, l, s):
+    clamp = lambda v: min(1.0, max(0.0, v))
+    return tuple(round(c * 255) for c in colorsys.hls_to_rgb(h, clamp(l), clamp(s)))
+
+
+def lighten(rgb, amount, chroma=1.0):
+    h, l, s = _toHls(rgb)
+    return _fromHls(h, 1.0 - (1.0 - l) * (1.0 - amount), s * chroma)
+
+
+def darken(rgb, amount, chroma=1.0):
+    h, l, s = _toHls(rgb)
+    return _fromHls(h, l * (1.0 - amount), s * chroma)
+
+
+def shade(rgb, amount):
+    h, l, s = _toHls(rgb)
+    return _fromHls(h, l + amount, s)
+
+
+def mix(rgb, other, bias):
+    """Linear mix of two colors, bias 0 being rgb and 1 being other."""
+    bias = min(1.0, max(0.0, bias))
+    return tuple(round(a + (b - a) * bias) for a, b in zip(rgb, other))
+
+
+def tint(rgb, other, amount):
+    """Shift the hue and saturation of rgb towards other, keeping its lightness."""
+    if amount <= 0:
+        return rgb
+
+    h, _, s = _toHls(mix(rgb, other, amount ** 0.3))
+    return _fromHls(h, _toHls(rgb)[1], s)
@@ -0,0 +1,223 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# NOTE: Only depends on PyQt6 so it can be used by the benchmarks in tools/
+# outside of Krita. The colors are passed in rather than read from variables.
+
+from PyQt6.QtWidgets import (QProxyStyle, QStyle, QStyleOptionTab, QStyleOptionComboBox, QAbstractScrollArea,
+                             QTabBar, QMainWindow, QMdiArea, QApplication)
+from PyQt6.QtGui import QColor, QPainter, QPainterPath, QPalette, QPen
+from PyQt6.QtCore import Qt, QRectF, QEvent
+
+class FlatStyle(QProxyStyle):
+    """
+    The flat theme as a native style: borderless toolbars, flat dock titles,
+    rounded tabs and flat combo boxes, drawn on top of Krita's current style.
+    Much cheaper to paint and polish than the equivalent style sheets, which
+    put every widget under Qt's style sheet style.
+
+    Although installed for the whole application, only widgets of the main
+    windows are drawn flat, and only the document tabs get the flat tabs,
+    just like the style sheets are kept local to them. Dialogs and the tab
+    bars of docked containers keep Krita's style."""
+
+    RADIUS = 4
+
+    def __init__(self, baseStyleName, colors, thinTabs=False, tabHeight=20):
+        super(FlatStyle, self).__init__(baseStyleName)
+        self.baseStyleName = baseStyleName
+        self.thinTabs = thinTabs
+        self.tabHeight = tabHeight
+        self.setColors(colors)
+
+    def setColors(self, colors):
+        """Set the colors from a dict of hex strings (without '#') with the
+        keys 'highlight', 'background', 'alternate', 'inactive_text_color'
+        and 'active_text_color', as found in variables. Widgets already drawn
+        with the style need a refresh() afterwards."""
+        self.background = QColor(f"#{colors['background']}")
+        self.alternate = QColor(f"#{colors['alternate']}")
+        self.highlight = QColor(f"#{colors['highlight']}")
+        self.inactiveText = QColor(f"#{colors['inactive_text_color']}")
+        self.activeText = QColor(f"#{colors['active_text_color']}")
+
+    def setRadius(self, radius):
+        self.RADIUS = radius
+
+    def setThinTabs(self, thinTabs, tabHeight=None):
+        self.thinTabs = thinTabs
+        if tabHeight:
+            self.tabHeight = tabHeight
+
+    def refresh(self):
+        """Redraw the widgets drawn by the style, e.g. after changing its colors,
+        and have the document tab bars recompute their tab sizes."""
+        for w in QApplication.allWidgets():
+            if self.inWindow(w):
+                if isinstance(w, QTabBar) and self.inDocumentArea(w):
+                    QApplication.sendEvent(w, QEvent(QEvent.Type.StyleChange))
+                w.update()
+
+    def inWindow(self, widget):
+        """Whether the widget is part of a main window (rather than e.g. a dialog)."""
+        return widget is not None and isinstance(widget.window(), QMainWindow)
+
+    def inDocumentArea(self, widget):
+        """Whether the widget is within the document area (the QMdiArea)."""
+        parent = widget.parentWidget() if widget is not None else None
+
+        while parent is not None:
+            if isinstance(parent, QMdiArea):
+                return True
+            parent = parent.parentWidget()
+
+        return False
+
+    def fillRounded(self, painter, rect, color, topOnly=False):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+
+        path = QPainterPath()
+        if topOnly:
+            # Round the top corners only by letting the bottom ones overflow the clip
+            painter.setClipRect(rect)
+            path.addRoundedRect(QRectF(rect.adjusted(0, 0, 0, self.RADIUS)), self.RADIUS, self.RADIUS)
+        else:
+            path.addRoundedRect(QRectF(rect), self.RADIUS, self.RADIUS)
+
+        painter.fillPath(path, color)
+        painter.restore()
+
+    def drawPrimitive(self, element, option, painter, widget=None):
+        PE = QStyle.PrimitiveElement
+        state = option.state
+
+        if not self.inWindow(widget):
+            return super().drawPrimitive(element, option, painter, widget)
+
+        if element == PE.PE_FrameTabBarBase and not self.inDocumentArea(widget):
+            return super().drawPrimitive(element, option, painter, widget)
+
+        if element in (PE.PE_PanelToolBar, PE.PE_FrameDockWidget, PE.PE_FrameTabBarBase):
+            # Borderless toolbars and docks, no tab bar base line
+            if element == PE.PE_PanelToolBar:
+                painter.fillRect(option.rect, self.background)
+            return
+
+        if element == PE.PE_PanelButtonTool:
+            if (state & QStyle.StateFlag.State_On or
+                state & QStyle.StateFlag.State_Sunken or
+                state & QStyle.StateFlag.State_MouseOver):
+                self.fillRounded(painter, option.rect, self.alternate)
+            return
+
+        if element == PE.PE_PanelButtonCommand:
+            fill = self.alternate if state & QStyle.StateFlag.State_MouseOver else self.background
+            painter.save()
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(QPen(self.alternate, 2))
+            painter.setBrush(fill)
+            painter.drawRoundedRect(QRectF(option.rect).adjusted(1, 1, -1, -1), self.RADIUS, self.RADIUS)
+            painter.restore()
+            return
+
+        super().drawPrimitive(element, option, painter, widget)
+
+    def drawControl(self, element, option, painter, widget=None):
+        CE = QStyle.ControlElement
+
+        if not self.inWindow(widget):
+            return super().drawControl(element, option, painter, widget)
+
+        if element in (CE.CE_TabBarTabShape, CE.CE_TabBarTabLabel) and not self.inDocumentArea(widget):
+            return super().drawControl(element, option, painter, widget)
+
+        if element == CE.CE_ToolBar:
+            painter.fillRect(option.rect, self.background)
+            return
+
+        if element == CE.CE_ShapedFrame and isinstance(widget, QAbstractScrollArea):
+            return # Frameless scroll areas
+
+        if element == CE.CE_DockWidgetTitle:
+            painter.fillRect(option.rect, self.background)
+            textRect = option.rect.adjusted(5, 0, -5, 0)
+            title = option.fontMetrics.elidedText(option.title, Qt.TextElideMode.ElideRight, textRect.width())
+            self.drawItemText(painter, textRect,
+                              Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+                              option.palette, bool(option.state & QStyle.StateFlag.State_Enabled),
+                              title, QPalette.ColorRole.WindowText)
+            return
+
+        if element == CE.CE_TabBarTabShape:
+            selected = option.state & QStyle.StateFlag.State_Selected
+            self.fillRounded(painter, option.rect, self.background if selected else self.alternate, topOnly=True)
+            return
+
+        if element == CE.CE_TabBarTabLabel:
+            tab = QStyleOptionTab(option)
+            hovered = option.state & QStyle.StateFlag.State_MouseOver
+            selected = option.state & QStyle.StateFlag.State_Selected
+            color = self.activeText if hovered or selected else self.inactiveText
+            palette = QPalette(option.palette)
+            palette.setColor(QPalette.ColorRole.WindowText, color)
+            palette.setColor(QPalette.ColorRole.ButtonText, color)
+            tab.palette = palette
+            return super().drawControl(element, tab, painter, widget)
+
+        super().drawControl(element, option, painter, widget)
+
+    def drawComplexControl(self, control, option, painter, widget=None):
+        if control == QStyle.ComplexControl.CC_ComboBox and self.inWindow(widget):
+            hovered = option.state & QStyle.StateFlag.State_MouseOver
+            self.fillRounded(painter, option.rect, self.alternate if hovered else self.background)
+
+            # Underline
+            line = option.rect.adjusted(self.RADIUS, 0, -self.RADIUS, 0)
+            painter.fillRect(line.left(), line.bottom() - 1, line.width(), 2, self.inactiveText)
+
+            arrow = QStyleOptionComboBox(option)
+            arrow.rect = self.subControlRect(control, option, QStyle.SubControl.SC_ComboBoxArrow, widget)
+            self.drawPrimitive(QStyle.PrimitiveElement.PE_IndicatorArrowDown, arrow, painter, widget)
+            return
+
+        super().drawComplexControl(control, option, painter, widget)
+
+    def pixelMetric(self, metric, option=None, widget=None):
+        PM = QStyle.PixelMetric
+
+        if not self.inWindow(widget):
+            return super().pixelMetric(metric, option, widget)
+
+        if metric in (PM.PM_ToolBarFrameWidth, PM.PM_DockWidgetFrameWidth):
+            return 0
+
+        if metric == PM.PM_DockWidgetTitleMargin:
+            return 5
+
+        return super().pixelMetric(metric, option, widget)
+
+    def sizeFromContents(self, contentsType, option, size, widget=None):
+        size = super().sizeFromContents(contentsType, option, size, widget)
+
+        if (contentsType == QStyle.ContentsType.CT_TabBarTab and self.thinTabs and
+            self.inWindow(widget) and self.inDocumentArea(widget) and
+            option.shape in (QTabBar.Shape.RoundedNorth, QTabBar.Shape.RoundedSouth)):
+            size.setHeight(self.tabHeight)
+
+        return size
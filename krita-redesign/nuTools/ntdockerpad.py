@@ -0,0 +1,150 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from PyQt6 import sip
+from PyQt6.QtWidgets import QMdiArea, QDockWidget
+from .ntadjusttosubwindowfilter import ntAdjustToSubwindowFilter
+from .ntwidgetpad import ntWidgetPad
+from .ntstrokefilter import ntStrokeFilter
+from .ntwidgetlocator import ntWidgetLocator
+from .ntpadconfig import DOCKER_PADS
+from .. import stylecache
+
+class ntDockerPad():
+    """
+    Turns the Krita docker with the given objectName into a Pad. The docker
+    widget is only borrowed the first time the Pad is shown, so dockers that
+    never get opened as a Pad cost nothing."""
+
+    def __init__(self, window, dockerName):
+        self.window = window
+        self.dockerName = dockerName
+        self.config = DOCKER_PADS[dockerName]
+        self.pad = None
+        self.dockerAction = None
+
+        locator = ntWidgetLocator.forWindow(window.qwindow())
+        self.mdiArea = locator.find(QMdiArea)
+        self.docker = locator.find(QDockWidget, dockerName)
+
+        # Create event filter, it's installed once the Pad exists
+        self.adjustFilter = ntAdjustToSubwindowFilter(self.mdiArea)
+
+        # Create visibility toggle action, once per window: a Pad that's
+        # turned off and on again gets its action back
+        action = locator.actions.get(self.config['action'])
+        if action is None or sip.isdeleted(action):
+            action = window.createAction(self.config['action'], self.config['actionText'], "settings")
+            action.setCheckable(True)
+            locator.actions[self.config['action']] = action
+
+        self.visibleAction = action
+        action.setEnabled(True)
+        action.blockSignals(True)
+        action.setChecked(self.config['shown'])
+        action.blockSignals(False)
+        action.toggled.connect(self.setPadVisible)
+        self.setPadVisible(self.config['shown'])
+
+    def createPad(self):
+        """Create the Pad and borrow the docker widget.
+        Returns False if the docker doesn't exist."""
+        if not self.docker or not self.mdiArea:
+            return False
+
+        self.pad = ntWidgetPad(self.mdiArea)
+        self.pad.setObjectName(self.config['padName'])
+        self.pad.setViewAlignment(self.config['alignment'])
+        self.pad.setStackOrder(self.config['stackOrder'])
+
+        if not self.pad.borrowDocker(self.docker):
+            self.pad.close()
+            self.pad = None
+            return False
+
+        self.adjustFilter.setTargetWidget(self.pad)
+        self.mdiArea.subWindowActivated.connect(self.ensureFilterIsInstalled)
+        self.window.qwindow().installEventFilter(self.adjustFilter)
+
+        # Disable the related QDockWidget
+        self.dockerAction = self.docker.toggleViewAction()
+        self.dockerAction.setEnabled(False)
+
+        self.updateStyleSheet()
+        self.pad.show()
+        self.ensureFilterIsInstalled(self.mdiArea.activeSubWindow())
+
+        return True
+
+    def setPadVisible(self, visible):
+        """Show or collapse the Pad, creating it on first show."""
+        if not self.pad:
+            if visible:
+                self.createPad()
+            return
+
+        # Not toggleWidgetVisible(): it treats False as 'toggle', and judges
+        # by isVisible(), which is also False while the Pad itself is hidden
+        self.pad.setWidgetVisible(visible)
+        self.pad.adjustToView()
+        self.pad.updateHideButtonIcon(visible)
+
+    def ensureFilterIsInstalled(self, subWin):
+        """Ensure that the current SubWindow has the filter installed,
+        and immediately move the Pad to current View."""
+        if subWin and self.pad:
+            # Installing it again does nothing, the cached states can't tell:
+            # borrowing the docker already caches the first subwindow
+            subWin.installEventFilter(self.adjustFilter)
+
+            self.pad.restoreViewState(subWin)
+            ntStrokeFilter.forMdiArea(self.mdiArea).installOnView(self.pad.activeView())
+            self.syncVisibleAction()
+
+    def syncVisibleAction(self):
+        """Match the visibility toggle action to the Pad's state of the current View
+        without triggering it."""
+        self.visibleAction.blockSignals(True)
+        self.visibleAction.setChecked(self.pad.isWidgetVisible())
+        self.visibleAction.blockSignals(False)
+
+    def findDockerAction(self, window, text):
+        return ntWidgetLocator.forWindow(window.qwindow()).dockerAction(text)
+
+    def updateStyleSheet(self):
+        """
+        Apply the shared Pad sheet, its rules are scoped by objectName so every
+        Pad gets the same one. Only needed when the sheets have been rebuilt."""
+        sheet = stylecache.current.get('pad')
+
+        if self.pad and sheet is not None and self.pad.styleSheet() != sheet:
+            self.pad.setStyleSheet(sheet)
+
+    def close(self):
+        # The action outlives the Pad, it mustn't create a new one
+        self.visibleAction.toggled.disconnect(self.setPadVisible)
+        self.visibleAction.setEnabled(False)
+
+        if self.dockerAction:
+            self.dockerAction.setEnabled(True)
+
+        if self.pad:
+            self.mdiArea.subWindowActivated.disconnect(self.ensureFilterIsInstalled)
+            pad, self.pad = self.pad, None
+            return pad.close()
+
+        return True
@@ -0,0 +1,90 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from PyQt6 import sip
+from PyQt6.QtWidgets import QMdiArea, QDockWidget, QToolBar
+from .ntwidgetlocator import ntWidgetLocator
+from .ntpadlayout import ntPadGroup
+
+class ntFocusMode():
+    """
+    Hides all of the window's chrome (menu bar, toolbars, dockers, status bar
+    and optionally the Pads) to paint full-canvas, and brings it back exactly
+    as it was. Each transition is one batch with updates disabled, so the main
+    window only relayouts and repaints once instead of once per widget."""
+
+    def __init__(self, window):
+        self.window = window
+        self.hidesPads = False
+        self.savedState = None
+        self.shownWidgets = []
+
+        action = window.createAction("toggleFocusMode", "Focus Mode", "settings")
+        action.setCheckable(True)
+        action.toggled.connect(self.setActive)
+        self.action = action
+
+    def isActive(self):
+        return self.savedState is not None
+
+    def setActive(self, active):
+        if active and not self.isActive():
+            self.enter()
+        elif not active and self.isActive():
+            self.leave()
+
+    def enter(self):
+        """Snapshot the window's layout, then hide the chrome in one go."""
+        qWin = self.window.qwindow()
+        self.savedState = qWin.saveState()
+
+        # Docks and toolbars come back through restoreState(), the rest
+        # is shown again by hand
+        chrome = [qWin.menuBar(), qWin.statusBar()]
+
+        if self.hidesPads:
+            mdiArea = ntWidgetLocator.forWindow(qWin).find(QMdiArea)
+            if mdiArea:
+                chrome += ntPadGroup.forParent(mdiArea).pads
+
+        qWin.setUpdatesEnabled(False)
+
+        self.shownWidgets = [w for w in chrome if w and not w.isHidden()]
+        for w in self.shownWidgets:
+            w.hide()
+
+        for w in qWin.findChildren(QDockWidget) + qWin.findChildren(QToolBar):
+            if w.parentWidget() is qWin and not w.isHidden():
+                w.hide()
+
+        qWin.setUpdatesEnabled(True)
+
+    def leave(self):
+        """Restore the exact layout from before enter()."""
+        qWin = self.window.qwindow()
+        qWin.setUpdatesEnabled(False)
+
+        qWin.restoreState(self.savedState)
+
+        for w in self.shownWidgets:
+            if not sip.isdeleted(w): # Pads may have been closed meanwhile
+                w.show()
+
+        qWin.setUpdatesEnabled(True)
+
+        self.savedState = None
+        self.shownWidgets = []
@@ -0,0 +1,70 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Dockers that can be turned into Pads, by the docker's objectName.
+# 'shown' is whether the Pad is shown (and thus its docker borrowed) on startup,
+# 'styled' whether it gets nu_toolbox_style (see stylecache.compileStyleSheets).
+DOCKER_PADS = {
+    'ToolBox': {
+        'padName': "toolBoxPad",
+        'alignment': 'left',
+        'stackOrder': 0,
+        'action': "showToolbox",
+        'actionText': "Show Toolbox",
+        'styled': True,
+        'shown': True
+    },
+    'sharedtooldocker': {
+        'padName': "toolOptionsPad",
+        'alignment': 'right',
+        'stackOrder': 0,
+        'action': "showToolOptions",
+        'actionText': "Show Tool Options",
+        'styled': False,
+        'shown': True
+    },
+    'KisLayerBox': {
+        'padName': "layersPad",
+        'alignment': 'right',
+        'stackOrder': 1,
+        'action': "showLayers",
+        'actionText': "Show Layers",
+        'menuText': "NuLayers",
+        'styled': False,
+        'shown': False
+    },
+    'PresetDocker': {
+        'padName': "brushPresetsPad",
+        'alignment': 'bottomleft',
+        'stackOrder': 0,
+        'action': "showBrushPresets",
+        'actionText': "Show Brush Presets",
+        'menuText': "NuBrushPresets",
+        'styled': False,
+        'shown': False
+    },
+    'ColorSelectorNg': {
+        'padName': "colorSelectorPad",
+        'alignment': 'bottomright',
+        'stackOrder': 0,
+        'action': "showColorSelector",
+        'actionText': "Show Color Selector",
+        'menuText': "NuColorSelector",
+        'styled': False,
+        'shown': False
+    }
+}
@@ -0,0 +1,206 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# NOTE: This module is pure Python on purpose (no Qt or Krita imports), so
+# the geometry can be checked and benchmarked outside of Krita, see
+# tools/benchmark_pad_layout.py.
+
+ANCHORS = (
+    'topleft', 'left', 'bottomleft',
+    'topright', 'right', 'bottomright',
+    'top', 'bottom'
+    )
+
+
+# Pads are never clipped below this, even if that means overlapping
+MIN_PAD_SIZE = 24
+
+
+def clip(size, available):
+    """Clip a Pad's size to the available space, but not below MIN_PAD_SIZE
+    (or its own size, if it's smaller than that)."""
+    return max(min(size, available), min(size, MIN_PAD_SIZE))
+
+
+def solveLayout(width, height, pads, margins=(0, 0, 0, 0)):
+    """
+    Resolve non-overlapping geometries for Pads placed on a View.
+
+    `pads` is an iterable of (key, anchor, order, padWidth, padHeight) tuples and
+    `margins` the (left, top, right, bottom) space to keep free along the View's
+    edges. Pads with the same anchor are stacked by ascending order, ties keep
+    their given order. 'topleft' and 'left' stack downwards along the left edge,
+    'bottomleft' upwards from the bottom, and likewise on the right. A Pad that
+    doesn't fit in its column anymore starts a new column next to it. 'top' and
+    'bottom' are laid out side by side, centered between the two columns.
+
+    Returns a dict mapping each key to an (x, y, width, height) tuple."""
+    left, top, right, bottom = margins
+    x0, y0 = left, top
+    availWidth = max(0, width - left - right)
+    availHeight = max(0, height - top - bottom)
+    x1, y1 = x0 + availWidth, y0 + availHeight
+
+    buckets = {anchor: [] for anchor in ANCHORS}
+    for index, (key, anchor, order, padWidth, padHeight) in enumerate(pads):
+        buckets[anchor if anchor in buckets else 'topleft'].append(
+            (order, index, key, padWidth, padHeight))
+
+    for bucket in buckets.values():
+        bucket.sort(key=lambda item: (item[0], item[1]))
+
+    result = {}
+
+    def placeColumn(down, up, maxWidth, side):
+        """Stack a column of Pads along the left or right edge. Pads that don't
+        fit below/above the ones already placed wrap into another column, further
+        towards the center. Returns the width all the columns occupy."""
+        offset = 0
+        columnWidth = 0
+        cursorTop, cursorBottom = y0, y1
+        placed = False
+
+        for direction, bucket in (('down', down), ('up', up)):
+            for _, _, key, padWidth, padHeight in bucket:
+                if placed and padHeight > cursorBottom - cursorTop:
+                    # Column is full, start the next one
+                    offset += columnWidth
+                    columnWidth = 0
+                    cursorTop, cursorBottom = y0, y1
+
+                w = clip(padWidth, maxWidth - offset)
+                h = clip(padHeight, cursorBottom - cursorTop)
+                x = x0 + offset if side == 'left' else x1 - offset - w
+
+                if direction == 'down':
+                    result[key] = (x, cursorTop, w, h)
+                    cursorTop += h
+                else:
+                    cursorBottom -= h
+                    result[key] = (x, cursorBottom, w, h)
+
+                columnWidth = max(columnWidth, w)
+                placed = True
+
+        return offset + columnWidth
+
+    leftWidth = placeColumn(buckets['topleft'] + buckets['left'],
+                            buckets['bottomleft'], availWidth, 'left')
+    rightWidth = placeColumn(buckets['topright'] + buckets['right'],
+                             buckets['bottomright'], availWidth - leftWidth, 'right')
+
+    rowX0 = x0 + leftWidth
+    rowWidth = max(0, availWidth - leftWidth - rightWidth)
+
+    def placeRow(row, maxHeight, side):
+        """Lay out a row of Pads along the top or bottom edge, centered.
+        Returns the height the row occupies."""
+        widths = []
+        remaining = rowWidth
+        for _, _, _, padWidth, _ in row:
+            w = clip(padWidth, remaining)
+            widths.append(w)
+            remaining = max(0, remaining - w)
+
+        rowHeight = 0
+        x = rowX0 + remaining // 2
+        for (_, _, key, _, padHeight), w in zip(row, widths):
+            h = clip(padHeight, maxHeight)
+            y = y0 if side == 'top' else y1 - h
+            result[key] = (x, y, w, h)
+            x += w
+            rowHeight = max(rowHeight, h)
+
+        return rowHeight
+
+    topHeight = placeRow(buckets['top'], availHeight, 'top')
+    placeRow(buckets['bottom'], availHeight - topHeight, 'bottom')
+
+    return result
+
+
+class ntPadGroup():
+    """
+    All the Pads sharing a parent (the MDI area of a window). The group lays
+    them out together, once per change of the View or of any Pad's size, and
+    hands out the cached result to every Pad asking in between."""
+
+    groups = {}
+
+    def __init__(self):
+        self.pads = []
+        self.lastKey = None
+        self.lastResult = {}
+        self.version = 0 # Counts the layouts, so Pads can tell theirs is outdated
+
+    @classmethod
+    def forParent(cls, parent):
+        """Get the group of the given parent, creating it if needed."""
+        if parent not in cls.groups:
+            cls.groups[parent] = ntPadGroup()
+
+        return cls.groups[parent]
+
+    @classmethod
+    def removeFromParent(cls, parent, pad):
+        """Remove a Pad from its parent's group, dropping the group once empty."""
+        group = cls.groups.get(parent)
+
+        if group:
+            group.removePad(pad)
+
+            if not group.pads:
+                del cls.groups[parent]
+
+    def addPad(self, pad):
+        if pad not in self.pads:
+            self.pads.append(pad)
+            self.lastKey = None
+
+    def removePad(self, pad):
+        if pad in self.pads:
+            self.pads.remove(pad)
+            self.lastKey = None
+
+    def geometry(self, pad, width, height, margins):
+        """
+        Return the (x, y, width, height) of the Pad in View coordinates. Pads
+        are laid out by the size they'd like to have (their sizeHint) rather than
+        the one they've been clipped to. Pads that have been hidden don't take 
+        up any space, except the one asking."""
+        entries = tuple(
+            (id(p), p.getViewAlignment(), p.stackOrder, p.sizeHint().width(), p.sizeHint().height())
+            for p in self.pads
+            if p is pad or not p.isHidden()
+            )
+        key = (width, height, margins, entries)
+
+        if key != self.lastKey:
+            result = solveLayout(width, height, entries, margins)
+
+            if result != self.lastResult:
+                self.version += 1
+
+                # Let the other Pads pick up their new geometry on their next paint
+                for p in self.pads:
+                    if p is not pad:
+                        p.update()
+
+            self.lastResult = result
+            self.lastKey = key
+
+        return self.lastResult.get(id(pad))
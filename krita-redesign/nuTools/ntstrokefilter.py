@@ -0,0 +1,148 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from PyQt6.QtWidgets import QWidget, QAbstractScrollArea
+from PyQt6.QtCore import Qt, QObject, QEvent, QRect
+from .ntpadlayout import ntPadGroup
+
+class ntStrokeFilter(QObject):
+    """Event Filter object. Watches the canvas of the Views for strokes (a press
+    followed by a drag) and suspends the Pads' geometry updates, optionally hiding
+    them, until the stroke ends."""
+
+    enabled = True
+    hidePads = False
+
+    filters = {}
+
+    CANVAS_CLASSES = ('KisOpenGLCanvas2', 'KisQPainterCanvas')
+
+    def __init__(self, mdiArea):
+        super(ntStrokeFilter, self).__init__(mdiArea)
+        self.mdiArea = mdiArea
+        self.canvases = set()
+        self.views = set()
+        self.pressed = False
+        self.stroking = False
+
+        # Work avoided during the last stroke and during all strokes
+        self.avoidedPaints = 0
+        self.lastStroke = {'avoidedPaints': 0, 'skippedAdjusts': 0}
+        self.totals = {'strokes': 0, 'avoidedPaints': 0, 'skippedAdjusts': 0}
+
+    @classmethod
+    def forMdiArea(cls, mdiArea):
+        """Get the stroke filter of the given QMdiArea, creating it if needed."""
+        if mdiArea not in cls.filters:
+            cls.filters[mdiArea] = ntStrokeFilter(mdiArea)
+
+        return cls.filters[mdiArea]
+
+    def eventFilter(self, obj, e):
+        """Event filter: Track presses, drags and releases on the canvas.
+        The events are never consumed, Krita still needs to paint with them."""
+        if not self.enabled:
+            return False
+
+        t = e.type()
+
+        if ((t == QEvent.Type.MouseButtonPress and e.button() == Qt.MouseButton.LeftButton) or
+            t == QEvent.Type.TabletPress):
+            self.pressed = True
+        elif t == QEvent.Type.MouseMove or t == QEvent.Type.TabletMove:
+            if self.pressed and not self.stroking:
+                self.beginStroke()
+        elif ((t == QEvent.Type.MouseButtonRelease and e.button() == Qt.MouseButton.LeftButton) or
+              t == QEvent.Type.TabletRelease):
+            self.pressed = False
+            if self.stroking:
+                self.endStroke()
+        elif t == QEvent.Type.Paint and self.stroking and self.hidePads:
+            self.countAvoidedPaints(obj, e.region())
+
+        return False
+
+    def installOnView(self, view):
+        """Install the filter on the canvas widget(s) of a View, if not done already.
+        Each View's canvases are only looked up once."""
+        if not view or view in self.views:
+            return
+
+        self.views.add(view)
+        view.destroyed.connect(lambda obj=None, v=view: self.views.discard(v))
+
+        for canvas in self.findCanvases(view):
+            if canvas not in self.canvases:
+                canvas.installEventFilter(self)
+                canvas.destroyed.connect(lambda obj=None, c=canvas: self.canvases.discard(c))
+                self.canvases.add(canvas)
+
+    def findCanvases(self, view):
+        canvases = [w for w in view.findChildren(QWidget)
+                    if any(w.inherits(name) for name in self.CANVAS_CLASSES)]
+
+        if not canvases:
+            scrollArea = view.findChild(QAbstractScrollArea)
+            if scrollArea:
+                canvases = [scrollArea.viewport()]
+
+        return canvases
+
+    def pads(self):
+        return ntPadGroup.forParent(self.mdiArea).pads
+
+    def beginStroke(self):
+        self.stroking = True
+        self.avoidedPaints = 0
+
+        for pad in self.pads():
+            pad.suspendForStroke(self.hidePads)
+
+    def endStroke(self):
+        self.stroking = False
+        pads = list(self.pads())
+        skippedAdjusts = sum(pad.skippedAdjusts for pad in pads)
+
+        # Show every Pad again before laying any of them out
+        for pad in pads:
+            pad.resumeAfterStroke()
+
+        for pad in pads:
+            pad.adjustToView()
+
+        self.lastStroke = {'avoidedPaints': self.avoidedPaints, 'skippedAdjusts': skippedAdjusts}
+        self.totals['strokes'] += 1
+        self.totals['avoidedPaints'] += self.avoidedPaints
+        self.totals['skippedAdjusts'] += skippedAdjusts
+
+    def report(self):
+        """The counters of the last stroke and of all strokes, as text."""
+        return (
+            f"Last stroke: {self.lastStroke['avoidedPaints']} Pad paints avoided, "
+            f"{self.lastStroke['skippedAdjusts']} Pad adjustments skipped\n"
+            f"All {self.totals['strokes']} strokes: {self.totals['avoidedPaints']} Pad paints avoided, "
+            f"{self.totals['skippedAdjusts']} Pad adjustments skipped"
+            )
+
+    def countAvoidedPaints(self, canvas, region):
+        """Count how many hidden Pads the canvas repainted underneath,
+        each of which would otherwise have had to be repainted too."""
+        for pad in self.pads():
+            if pad.hiddenForStroke:
+                padRect = QRect(canvas.mapFrom(self.mdiArea, pad.pos()), pad.size())
+                if region.intersects(padRect):
+                    self.avoidedPaints += 1
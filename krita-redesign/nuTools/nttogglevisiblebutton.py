@@ -18,14 +18,14 @@
 
 from PyQt6.QtWidgets import QToolButton, QSizePolicy
 from PyQt6.QtCore import Qt, QSize
-from .. import variables
 
 class ntToggleVisibleButton(QToolButton):
     def __init__(self, parent = None):
         super(ntToggleVisibleButton, self).__init__(parent)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Maximum)
         self.setIconSize(QSize(11, 11))
-        self.setStyleSheet(variables.nu_toggle_button_style)
+        # Styled by the Pad's sheet, see stylecache.compileStyleSheets()
+        self.setObjectName("padToggleButton")
         
     def setArrow(self, alignment):
         if alignment == "right":
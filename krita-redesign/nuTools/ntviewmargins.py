@@ -0,0 +1,121 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from krita import Krita
+from PyQt6.QtWidgets import QWidget, QAbstractScrollArea
+from PyQt6.QtCore import Qt, QObject, QEvent
+
+class ntViewMargins(QObject):
+    """
+    Measures the ruler and scrollbar extents of a canvas View. The result is
+    cached per screen and device pixel ratio, and thrown away whenever Krita's
+    configuration, the style or the visibility of a measured widget changes."""
+
+    _instance = None
+
+    # Fallbacks (Krita's defaults on Windows) for when the View can't be measured
+    DEFAULT_RULER_MARGIN = 20
+    DEFAULT_SCROLLBAR_MARGIN = 14
+
+    def __init__(self, parent=None):
+        super(ntViewMargins, self).__init__(parent)
+        self.cache = {}
+        self.watched = []
+
+        Krita.instance().notifier().configurationChanged.connect(self.invalidate)
+
+    @classmethod
+    def instance(cls):
+        """Get the shared margins cache."""
+        if not cls._instance:
+            cls._instance = ntViewMargins()
+
+        return cls._instance
+
+    def eventFilter(self, obj, e):
+        """Event filter: Drop the cache if a measured widget was shown or hidden
+        (e.g. the rulers were toggled) or restyled."""
+        if (e.type() == QEvent.Type.ShowToParent or
+            e.type() == QEvent.Type.HideToParent or
+            e.type() == QEvent.Type.StyleChange):
+            self.invalidate()
+
+        return False
+
+    def invalidate(self):
+        """Forget all measurements."""
+        for w in self.watched:
+            try:
+                w.removeEventFilter(self)
+            except RuntimeError: # Already deleted
+                pass
+
+        self.watched = []
+        self.cache = {}
+
+    def margins(self, view):
+        """
+        Return the (ruler, scrollbar) margins of the View in pixels."""
+        screen = view.screen()
+        key = (screen.name() if screen else "", view.devicePixelRatioF())
+
+        if key not in self.cache:
+            self.cache[key] = self.measure(view)
+
+        return self.cache[key]
+
+    def measure(self, view):
+        """
+        Measure the width of the vertical ruler and the extent of the
+        scrollbars of the View."""
+        rulerMargin = None
+        scrollBarMargin = None
+
+        for child in view.findChildren(QWidget):
+            if child.inherits('KoRuler') and child.height() > child.width():
+                self.watch(child)
+                rulerMargin = child.width() if child.isVisibleTo(view) else 0
+                break
+
+        scrollArea = view.findChild(QAbstractScrollArea)
+
+        if scrollArea:
+            scrollBar = scrollArea.verticalScrollBar()
+            self.watch(scrollBar)
+
+            if scrollArea.verticalScrollBarPolicy() == Qt.ScrollBarPolicy.ScrollBarAlwaysOff:
+                scrollBarMargin = 0
+            else:
+                scrollBarMargin = scrollBar.sizeHint().width()
+
+        if rulerMargin is None:
+            if Krita.instance().readSetting("", 'showrulers', "true") == "true":
+                rulerMargin = self.DEFAULT_RULER_MARGIN
+            else:
+                rulerMargin = 0
+
+        if scrollBarMargin is None:
+            if Krita.instance().readSetting("", "hideScrollbars", "false") == "true":
+                scrollBarMargin = 0
+            else:
+                scrollBarMargin = self.DEFAULT_SCROLLBAR_MARGIN
+
+        return (rulerMargin, scrollBarMargin)
+
+    def watch(self, widget):
+        widget.installEventFilter(self)
+        self.watched.append(widget)
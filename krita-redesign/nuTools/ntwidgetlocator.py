@@ -0,0 +1,89 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+from PyQt6 import sip
+
+class ntWidgetLocator():
+    """
+    Per-window registry of the widgets and actions the plugin looks up.
+    Each one is resolved with a (recursive) findChild or menu scan only once,
+    then kept until it's destroyed. The references are strong on purpose: the
+    Python wrappers of widgets Krita owns are thrown away as soon as nothing
+    in Python holds them, which would empty a weak registry right away."""
+
+    locators = {}
+
+    def __init__(self, qWin):
+        self.qWin = qWin
+        self.widgets = {}
+        self.dockerActions = None
+        # Actions the plugin created, by name, they can't be created twice
+        self.actions = {}
+
+    @classmethod
+    def forWindow(cls, qWin):
+        """Get the registry of the given QMainWindow, creating it if needed."""
+        if qWin not in cls.locators:
+            cls.locators[qWin] = ntWidgetLocator(qWin)
+            qWin.destroyed.connect(lambda obj=None, w=qWin: cls.locators.pop(w, None))
+
+        return cls.locators[qWin]
+
+    def find(self, widgetClass, name=None):
+        """
+        Equivalent of qWin.findChild(widgetClass, name), resolved once.
+        Returns None if no such widget exists (which isn't cached)."""
+        key = (widgetClass, name)
+        wdgt = self.widgets.get(key)
+
+        if wdgt is not None and not sip.isdeleted(wdgt):
+            return wdgt
+
+        if name is None:
+            wdgt = self.qWin.findChild(widgetClass)
+        else:
+            wdgt = self.qWin.findChild(widgetClass, name)
+
+        if wdgt is None:
+            self.widgets.pop(key, None)
+            return None
+
+        self.widgets[key] = wdgt
+        wdgt.destroyed.connect(lambda obj=None, k=key: self.widgets.pop(k, None))
+
+        return wdgt
+
+    def dockerAction(self, text):
+        """
+        Find the action of the docker titled `text` in Settings -> Dockers.
+        The menu is only scanned again if the action isn't known (anymore).
+        Returns False if there's no such action."""
+        action = self.dockerActions.get(text) if self.dockerActions else None
+
+        if action is None or sip.isdeleted(action):
+            self.scanDockerActions()
+            action = self.dockerActions.get(text)
+
+        return action if action is not None else False
+
+    def scanDockerActions(self):
+        self.dockerActions = {}
+
+        for m in self.qWin.actions():
+            if m.objectName() == "settings_dockers_menu":
+                for a in m.menu().actions():
+                    self.dockerActions[a.text().replace('&', '')] = a
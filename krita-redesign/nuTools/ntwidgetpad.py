@@ -17,10 +17,11 @@
 
 
 from PyQt6.QtWidgets import QWidget, QToolButton, QDockWidget, QVBoxLayout, QSizePolicy, QScrollArea
-from PyQt6.QtCore import Qt, QSize, QPoint
+from PyQt6.QtCore import Qt, QSize, QPoint, QRect
 from .ntscrollareacontainer import ntScrollAreaContainer
 from .nttogglevisiblebutton import ntToggleVisibleButton
-from krita import Krita
+from .ntviewmargins import ntViewMargins
+from .ntpadlayout import ntPadGroup, ANCHORS
 
 class ntWidgetPad(QWidget):
     """
@@ -37,16 +38,31 @@ class ntWidgetPad(QWidget):
         self.setLayout(QVBoxLayout())
         self.layout().setContentsMargins(4,4,4,4)
         self.alignment = 'left'
+        self.stackOrder = 0
 
         # Members to hold a borrowed widget and it's original parent docker for returning
         self.widget = None
         self.widgetDocker = None
 
+        # Set while the user is painting a stroke on the canvas
+        self.strokeSuspended = False
+        self.hiddenForStroke = False
+        self.skippedAdjusts = 0
+
+        # Per-subwindow cache of the Pad's visibility, size and position
+        self.viewStates = {}
+
+        # What the Pad was last adjusted for, see adjustKey()
+        self.adjustedFor = None
+
          # Visibility toggle
         self.btnHide = ntToggleVisibleButton()
         self.btnHide.clicked.connect(self.toggleWidgetVisible)
         self.layout().addWidget(self.btnHide)
 
+        if parent:
+            ntPadGroup.forParent(parent).addPad(self)
+
     def activeView(self):
         """
         Get the View widget of the active subwindow."""
@@ -65,20 +81,41 @@ class ntWidgetPad(QWidget):
         return None
 
 
+    def adjustKey(self, view):
+        """
+        Everything the Pad's geometry depends on: its size hint, the View's
+        geometry and margins, and the layout of the Pads sharing the View."""
+        return (
+            self.sizeHint(),
+            self.viewRect(view),
+            ntViewMargins.instance().margins(view),
+            ntPadGroup.forParent(self.parentWidget()).version
+            )
+
+
     def adjustToView(self):
         """
         Adjust the position and size of the Pad to that of the active View."""
+        if self.strokeSuspended:
+            self.skippedAdjusts += 1
+            return
+
         view = self.activeView()
         if view:            
             self.resizeToView()
 
-            globalTargetPos = QPoint()
-            if self.alignment == 'left':
-                globalTargetPos = view.mapToGlobal(QPoint(self.rulerMargin(), 0))
-            elif self.alignment == 'right':
-                globalTargetPos = view.mapToGlobal(QPoint(view.width() - self.width() - self.scrollBarMargin(), 0))
+            # Resolve the geometry together with all other Pads of the window
+            margins = (self.rulerMargin(), 0, self.scrollBarMargin(), self.scrollBarMargin())
+            geometry = ntPadGroup.forParent(self.parentWidget()).geometry(
+                self, view.width(), view.height(), margins)
 
-            self.move(self.parentWidget().mapFromGlobal(globalTargetPos))
+            if geometry:
+                x, y, w, h = geometry
+                self.resize(w, h)
+                self.move(view.mapTo(self.parentWidget(), QPoint(x, y)))
+
+            self.adjustedFor = self.adjustKey(view)
+            self.storeViewState()
 
 
     def borrowDocker(self, docker):
@@ -112,14 +149,29 @@ class ntWidgetPad(QWidget):
         Since the plugins works by borrowing the actual docker 
         widget we need to ensure its returned upon closing the pad"""
         self.returnDocker()
+
+        if self.parentWidget():
+            ntPadGroup.removeFromParent(self.parentWidget(), self)
+
         return super().closeEvent(e)
 
 
+    def forgetViewState(self, subWin):
+        """
+        Drop the cached state of a subwindow, e.g. when it's been closed."""
+        self.viewStates.pop(subWin, None)
+
+
     def paintEvent(self, e):
         """
         Needed to resize the Pad if the user decides to 
-        change the icon size of the toolbox"""
-        self.adjustToView()
+        change the icon size of the toolbox. Only adjusts if anything 
+        the geometry depends on changed since the last time."""
+        view = self.activeView()
+
+        if view and self.adjustKey(view) != self.adjustedFor:
+            self.adjustToView()
+
         return super().paintEvent(e)
 
 
@@ -153,11 +205,39 @@ class ntWidgetPad(QWidget):
             self.resize(newSize)
 
 
+    def restoreViewState(self, subWin):
+        """
+        Apply the cached state of a subwindow to the Pad. The stored size and 
+        position are only reused if the View hasn't changed its geometry since,
+        otherwise they get recomputed. Returns True if a cached state was used."""
+        state = self.viewStates.get(subWin)
+        view = self.activeView()
+
+        if not state or not view:
+            self.adjustToView()
+            return False
+
+        if self.widget and self.isWidgetVisible() != state['visible']:
+            self.setWidgetVisible(state['visible'])
+            self.updateHideButtonIcon(state['visible'])
+
+        if state['viewRect'] == self.viewRect(view):
+            self.resize(state['size'])
+            self.move(state['pos'])
+            self.adjustedFor = self.adjustKey(view)
+        else:
+            self.adjustToView()
+
+        return True
+
+
     def returnDocker(self):
         """
         Return the borrowed docker to it's original QDockWidget"""
         # Ensure there's a widget to return
         if self.widget:
+            self.widget.setVisible(True)
+
             if isinstance(self.widget, ntScrollAreaContainer):
                 self.widgetDocker.setWidget(self.widget.scrollArea())
             else:
@@ -169,56 +249,135 @@ class ntWidgetPad(QWidget):
 
 
     def rulerMargin(self):
-        if Krita.instance().readSetting("", 'showrulers', "true") == "true":
-            return 20 # Canvas ruler pixel width on Windows
+        """
+        Width of the active View's vertical ruler, 0 if it's hidden."""
+        view = self.activeView()
+        if view:
+            return ntViewMargins.instance().margins(view)[0]
+
         return 0
 
 
     def scrollBarMargin(self):
-        if Krita.instance().readSetting("", "hideScrollbars", "false") == "true":
-            return 0
+        """
+        Extent of the active View's scrollbars, 0 if they're hidden."""
+        view = self.activeView()
+        if view:
+            return ntViewMargins.instance().margins(view)[1]
+
+        return 0
+
+
+    def suspendForStroke(self, hide=False):
+        """
+        Stop adjusting to the View while a stroke is being painted, 
+        and optionally get out of the way entirely."""
+        self.strokeSuspended = True
+        self.skippedAdjusts = 0
+        self.hiddenForStroke = hide and self.isVisible()
+
+        if self.hiddenForStroke:
+            self.hide()
+
+
+    def resumeAfterStroke(self):
+        """
+        Undo suspendForStroke(). The Pad still needs to be adjusted to the View afterwards."""
+        self.strokeSuspended = False
+
+        if self.hiddenForStroke:
+            self.hiddenForStroke = False
+            self.show()
+
+
+    def storeViewState(self):
+        """
+        Remember the Pad's current visibility, size and position for the active subwindow."""
+        subWin = self.parentWidget().activeSubWindow() if self.parentWidget() else None
+        view = self.activeView()
+
+        if not subWin or not view:
+            return
 
-        return 14 # Canvas crollbar pixel width/height on Windows 
+        if subWin not in self.viewStates:
+            subWin.destroyed.connect(lambda obj=None, s=subWin: self.forgetViewState(s))
+
+        self.viewStates[subWin] = {
+            'visible': self.isWidgetVisible(),
+            'size': self.size(),
+            'pos': self.pos(),
+            'viewRect': self.viewRect(view)
+        }
+
+
+    def setStackOrder(self, order):
+        """
+        Set where the Pad goes among other Pads sharing its anchor, lower comes first."""
+        self.stackOrder = order
 
 
     def setViewAlignment(self, newAlignment):
         """
-        Set the Pad's alignment to the view to either 'left' or 'right'. 
+        Set the Pad's anchor on the view to one of 'left', 'right', 'top', 'bottom' 
+        or a corner ('topleft', 'topright', 'bottomleft', 'bottomright').
         Returns False if the argument is an invalid value."""
         if isinstance(newAlignment, str):
-            if (newAlignment.lower() == 'left' or
-                newAlignment.lower() == 'right'):
+            if newAlignment.lower() in ANCHORS:
                 self.alignment = newAlignment.lower()
 
-                self.btnHide.setArrow(self.alignment)
+                self.btnHide.setArrow(self.side())
 
                 return True
     
         return False
 
 
+    def side(self):
+        """
+        The side ('left' or 'right') of the View the Pad collapses towards."""
+        return 'right' if self.alignment.endswith('right') else 'left'
+
+
     def toggleWidgetVisible(self, value=None):
         if not value:
             value = not self.widget.isVisible()
         
-        self.widget.setVisible(value)
+        self.setWidgetVisible(value)
         self.adjustToView()  
         self.updateHideButtonIcon(value)
 
 
+    def setWidgetVisible(self, visible):
+        """
+        Expand or collapse the borrowed widget."""
+        self.widget.setVisible(visible)
+
+
+    def isWidgetVisible(self):
+        """
+        Whether the borrowed widget is expanded, regardless of the Pad itself being shown."""
+        return not self.widget.isHidden() if self.widget else False
+
+
     def updateHideButtonIcon(self, isVisible): 
         """
         Flip the direction of the arrow to fit the Pads current visibility"""
-        if self.alignment == 'left':
+        if self.side() == 'left':
             if isVisible:
                 self.btnHide.setArrowType(Qt.ArrowType.LeftArrow)
             else:
                 self.btnHide.setArrowType(Qt.ArrowType.RightArrow)
-        elif self.alignment == 'right':
+        elif self.side() == 'right':
             if isVisible:
                 self.btnHide.setArrowType(Qt.ArrowType.RightArrow)
             else:
                 self.btnHide.setArrowType(Qt.ArrowType.LeftArrow)
 
+    def viewRect(self, view):
+        """
+        The View's geometry in the Pad's parent coordinates."""
+        return QRect(view.mapTo(self.parentWidget(), QPoint(0, 0)), view.size())
+
+
     def getViewAlignment(self):
         return self.alignment
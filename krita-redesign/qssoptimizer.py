@@ -0,0 +1,291 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Selector cost analysis for the generated style sheets.
+#
+# Qt indexes style rules by the type (or #id) of the selector's last part, so
+# `QSpinBox` is only ever tested against spin boxes, while any selector ending
+# in `*` (`*`, `* > *`, `QScrollArea *`, `QDockWidget > *`) is tested against
+# every widget the sheet applies to, on every polish.
+#
+# NOTE: Pure Python on purpose, widgets are only duck typed (metaObject(),
+# objectName(), parentWidget(), property()), so this can be used from the
+# tools/ outside of Krita as well as at runtime.
+
+import re
+
+_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+_TYPE = re.compile(r'\*|[A-Za-z_]\w*')
+_PART = re.compile(r'\.([\w-]+)|#([\w-]+)|\[([\w-]+)\s*(?:=\s*"?([^"\]]*)"?)?\]|::?!?[\w-]+(?:\([^)]*\))?')
+
+
+def parseRules(sheet):
+    """
+    Split a style sheet into a list of (selectors, body) rules, where
+    selectors is a list of the comma separated selectors of the rule."""
+    rules = []
+
+    for match in re.finditer(r'([^{}]+)\{([^{}]*)\}', _COMMENT.sub('', sheet)):
+        selectors = [s.strip() for s in match.group(1).split(',') if s.strip()]
+        if selectors:
+            rules.append((selectors, match.group(2).strip()))
+
+    return rules
+
+
+def serializeRules(rules):
+    return "\n".join(f"{', '.join(selectors)} {{ {body} }}" for selectors, body in rules)
+
+
+def parseSelector(selector):
+    """
+    Split a selector into its compound parts and the combinators (' ' or '>') between them.
+    Each part is a (type, parts) tuple, type being None when not given."""
+    tokens = re.sub(r'\s*>\s*', ' > ', selector.strip()).split()
+    compounds = []
+    combinators = []
+    pending = None
+
+    for token in tokens:
+        if token == '>':
+            pending = '>'
+            continue
+
+        if compounds:
+            combinators.append(pending or ' ')
+        pending = None
+
+        m = _TYPE.match(token)
+        typ = m.group(0) if m else None
+        compounds.append((typ, token[m.end():] if m else token))
+
+    return compounds, combinators
+
+
+def isUniversal(selector):
+    """Whether the selector's subject (last part) has no type or #id,
+    i.e. Qt tests it against every widget."""
+    compounds, _ = parseSelector(selector)
+    if not compounds:
+        return False
+
+    typ, parts = compounds[-1]
+    return (typ is None or typ == '*') and '#' not in parts
+
+
+def simplifySelector(selector):
+    """
+    Return an equivalent, cheaper selector: a leading `* >` or `* ` is
+    dropped, since every widget a sheet applies to (bar a top-level window)
+    has a parent. Selectors that can't be simplified are returned as is."""
+    simplified = re.sub(r'^\*\s*(>\s*|\s+)', '', selector.strip())
+
+    if simplified and simplified != selector.strip() and not isUniversal(simplified):
+        return simplified
+
+    return selector
+
+
+def optimizeSheet(sheet):
+    """
+    The runtime pass: apply simplifySelector() to every rule of the sheet.
+    Returns the (possibly) rewritten sheet and a list of (old, new) selectors."""
+    changes = []
+
+    def rewrite(match):
+        selectors = match.group(1).split(',')
+        newSelectors = []
+
+        for s in selectors:
+            new = simplifySelector(s)
+            if new != s:
+                changes.append((s.strip(), new))
+                newSelectors.append(f" {new} ")
+            else:
+                newSelectors.append(s)
+
+        return f"{','.join(newSelectors)}{{"
+
+    optimized = re.sub(r'([^{}]+)\{', rewrite, _COMMENT.sub('', sheet))
+    return optimized, changes
+
+
+def dropUniversalRules(sheet):
+    """
+    Remove every universal selector from the sheet, and rules left without
+    selectors. Unlike optimizeSheet() this changes the styling, it's meant
+    for trading looks for speed."""
+    rules = []
+
+    for selectors, body in parseRules(sheet):
+        selectors = [s for s in selectors if not isUniversal(s)]
+        if selectors:
+            rules.append((selectors, body))
+
+    return serializeRules(rules)
+
+
+def scopeSheet(sheet, scope, descendants=True):
+    """
+    Restrict a sheet to the widget with the objectName `scope` (e.g. '#toolBoxPad').
+    Typed single part selectors also match that widget itself, and with
+    descendants every selector matches within it as well. This way several
+    widgets can share one sheet, each picking only the rules meant for it."""
+    rules = []
+
+    for selectors, body in parseRules(sheet):
+        scoped = []
+
+        for selector in selectors:
+            compounds, _ = parseSelector(selector)
+            typ, parts = compounds[0]
+
+            if len(compounds) == 1 and typ:
+                scoped.append(f"{typ}{scope}{parts}")
+            if descendants:
+                scoped.append(f"{scope} {selector}")
+
+        if scoped:
+            rules.append((scoped, body))
+
+    return serializeRules(rules)
+
+
+""" MATCHING """
+
+def classNames(widget):
+    """The class names of a widget, from most to least derived."""
+    names = []
+    meta = widget.metaObject()
+
+    while meta:
+        names.append(meta.className())
+        meta = meta.superClass()
+
+    return names
+
+
+def compoundMatches(widget, compound):
+    typ, parts = compound
+
+    if typ and typ != '*' and typ not in classNames(widget):
+        return False
+
+    for m in _PART.finditer(parts):
+        cls, objId, prop, value = m.groups()
+
+        if cls and widget.metaObject().className() != cls:
+            return False
+        if objId and widget.objectName() != objId:
+            return False
+        if prop:
+            actual = widget.property(prop)
+            if actual is None:
+                return False
+            if value is not None and str(getattr(actual, 'value', actual)).lower() != value.lower():
+                return False
+
+        # Pseudo states and sub-controls don't change which widgets are tested
+
+    return True
+
+
+def selectorMatches(widget, selector):
+    compounds, combinators = parseSelector(selector)
+    return bool(compounds) and _matches(widget, compounds, combinators, len(compounds) - 1)
+
+
+def _matches(widget, compounds, combinators, i):
+    if not compoundMatches(widget, compounds[i]):
+        return False
+
+    if i == 0:
+        return True
+
+    parent = widget.parentWidget()
+
+    if combinators[i - 1] == '>':
+        return parent is not None and _matches(parent, compounds, combinators, i - 1)
+
+    while parent is not None:
+        if _matches(parent, compounds, combinators, i - 1):
+            return True
+        parent = parent.parentWidget()
+
+    return False
+
+
+def testedWidgets(widgets, selector):
+    """The widgets Qt has to test the selector against, given its indexing."""
+    compounds, _ = parseSelector(selector)
+
+    if not compounds or isUniversal(selector):
+        return list(widgets)
+
+    typ, parts = compounds[-1]
+    if typ and typ != '*':
+        return [w for w in widgets if typ in classNames(w)]
+
+    objId = re.search(r'#([\w-]+)', parts).group(1)
+    return [w for w in widgets if w.objectName() == objId]
+
+
+def scoreSheet(sheet, widgets):
+    """
+    Score every selector of the sheet against the widgets it applies to (the
+    widget the sheet is set on and all its children). Returns a list of
+    (selector, tested, matched) tuples, most expensive first."""
+    scores = []
+
+    for selectors, _ in parseRules(sheet):
+        for selector in selectors:
+            tested = testedWidgets(widgets, selector)
+            matched = [w for w in tested if selectorMatches(w, selector)]
+            scores.append((selector, len(tested), len(matched)))
+
+    scores.sort(key=lambda s: s[1], reverse=True)
+    return scores
+
+
+def proposeSelectors(selector, widgets):
+    """
+    Propose typed replacements for a universal selector: one selector per
+    class that actually matches in the given widgets, which styles exactly
+    the same widgets of this tree. Widgets created later with other classes
+    would no longer be styled, so these are proposals, not runtime rewrites.
+    The selector itself is returned if the replacements wouldn't be tested
+    against fewer widgets, e.g. because one of them is QWidget."""
+    if not isUniversal(selector):
+        return [simplifySelector(selector)]
+
+    compounds, _ = parseSelector(selector)
+    typ, parts = compounds[-1]
+    prefix = selector.strip()
+    prefix = prefix[:len(prefix) - len(f"{typ or ''}{parts}")]
+
+    seen = []
+    for w in widgets:
+        if selectorMatches(w, selector):
+            name = w.metaObject().className()
+            if name not in seen:
+                seen.append(name)
+
+    proposals = [f"{prefix}{name}{parts}" for name in seen]
+    if sum(len(testedWidgets(widgets, p)) for p in proposals) >= len(widgets):
+        return [selector]
+
+    return proposals
@@ -15,29 +15,60 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
+import os
 from krita import *
 from .nuTools.nttoolbox import ntToolBox
 from .nuTools.nttooloptions import ntToolOptions
+from .nuTools.ntdockerpad import ntDockerPad, DOCKER_PADS
+from .nuTools.ntstrokefilter import ntStrokeFilter
+from .nuTools.ntwidgetlocator import ntWidgetLocator
+from .nuTools.ntfocusmode import ntFocusMode
 from . import variables
-from PyQt6.QtWidgets import QMessageBox
+from . import stylecache
+from . import colorscheme
+from .themeoverrides import ThemeWatcher, OVERRIDES_NAME
+from .flatstyle import FlatStyle
+from PyQt6.QtWidgets import QMessageBox, QApplication, QMdiArea
+from PyQt6.QtGui import QPalette
     
 class Redesign(Extension):
 
     usesFlatTheme = False
+    usesNativeFlatTheme = False
     usesBorderlessToolbar = False
     usesThinDocumentTabs = False
     usesNuToolbox = False
     usesNuToolOptions = False
+    usesStrokeAwarePads = False
+    hidesPadsWhilePainting = False
+    usesPerformanceMode = False
+    usesAutoPerformanceMode = False
+    focusModeHidesPads = False
+    usesRedesignColors = False
+    usesManyTabs = False
+    autoPerformanceEngaged = False
+    performanceModePixels = 40000000
     ntTB = None
     ntTO = None
+    flatStyle = None
+    focusMode = None
+    originalPalette = None
+    themeWatcher = None
+    redesignColorsAction = None
  
     def __init__(self, parent):
         super().__init__(parent)
+        # Additional docker Pads, by docker objectName
+        self.usesDockerPad = {}
+        self.dockerPads = {}
 
     def setup(self):
         if Application.readSetting("Redesign", "usesFlatTheme", "true") == "true":
             self.usesFlatTheme = True
 
+        if Application.readSetting("Redesign", "usesNativeFlatTheme", "false") == "true":
+            self.usesNativeFlatTheme = True
+
         if Application.readSetting("Redesign", "usesBorderlessToolbar", "true") == "true":
             self.usesBorderlessToolbar = True
 
@@ -50,6 +81,45 @@ class Redesign(Extension):
         if Application.readSetting("Redesign", "usesNuToolOptions", "true") == "true":
             self.usesNuToolOptions = True
 
+        if Application.readSetting("Redesign", "usesStrokeAwarePads", "true") == "true":
+            self.usesStrokeAwarePads = True
+
+        if Application.readSetting("Redesign", "hidesPadsWhilePainting", "false") == "true":
+            self.hidesPadsWhilePainting = True
+
+        if Application.readSetting("Redesign", "usesPerformanceMode", "false") == "true":
+            self.usesPerformanceMode = True
+
+        if Application.readSetting("Redesign", "usesAutoPerformanceMode", "false") == "true":
+            self.usesAutoPerformanceMode = True
+
+        if Application.readSetting("Redesign", "focusModeHidesPads", "false") == "true":
+            self.focusModeHidesPads = True
+
+        if Application.readSetting("Redesign", "usesRedesignColors", "false") == "true":
+            self.usesRedesignColors = True
+
+        if Application.readSetting("Redesign", "usesManyTabs", "false") == "true":
+            self.usesManyTabs = True
+
+        # Document size (width * height) above which performance mode engages automatically
+        try:
+            self.performanceModePixels = int(Application.readSetting("Redesign", "performanceModePixels", str(self.performanceModePixels)))
+        except ValueError:
+            pass # Malformed setting, keep the default
+
+        # User overrides of the theme, re-applied whenever the file is saved
+        self.themeWatcher = ThemeWatcher(os.path.join(Application.getAppDataLocation(), OVERRIDES_NAME))
+        self.themeWatcher.changed.connect(self.themeOverridesChanged)
+        self.themeWatcher.failed.connect(self.showThemeOverrides)
+
+        self.updateStrokeFilter()
+        ntStrokeFilter.hidePads = self.hidesPadsWhilePainting
+
+        for name, config in DOCKER_PADS.items():
+            if 'menuText' in config:
+                self.usesDockerPad[name] = Application.readSetting("Redesign", f"uses{config['menuText']}", "false") == "true"
+
     def createActions(self, window):
         actions = []
 
@@ -75,6 +145,55 @@ class Redesign(Extension):
         if Application.readSetting("", "ToolOptionsInDocker", "false") == "true":
             actions[4].setChecked(self.usesNuToolOptions)
 
+        actions.append(window.createAction("strokeAwarePads", "Pause Pads While Painting", ""))
+        actions[5].setCheckable(True)
+        actions[5].setChecked(self.usesStrokeAwarePads)
+
+        actions.append(window.createAction("hidePadsWhilePainting", "Hide Pads While Painting", ""))
+        actions[6].setCheckable(True)
+        actions[6].setChecked(self.hidesPadsWhilePainting)
+
+        actions.append(window.createAction("nativeFlatTheme", "Native Flat Theme (faster)", ""))
+        actions[7].setCheckable(True)
+        actions[7].setChecked(self.usesNativeFlatTheme)
+
+        actions.append(window.createAction("performanceMode", "Performance Mode", ""))
+        actions[8].setCheckable(True)
+        actions[8].setChecked(self.usesPerformanceMode)
+
+        actions.append(window.createAction("autoPerformanceMode", "Performance Mode on Large Documents", ""))
+        actions[9].setCheckable(True)
+        actions[9].setChecked(self.usesAutoPerformanceMode)
+
+        actions.append(window.createAction("focusModeHidesPads", "Hide Pads in Focus Mode", ""))
+        actions[10].setCheckable(True)
+        actions[10].setChecked(self.focusModeHidesPads)
+
+        actions.append(window.createAction("redesignColors", "Redesign Color Scheme", ""))
+        actions[11].setCheckable(True)
+        actions[11].setChecked(self.usesRedesignColors)
+        self.redesignColorsAction = actions[11]
+
+        actions.append(window.createAction("manyTabs", "Fixed Width Tabs (many documents)", ""))
+        actions[12].setCheckable(True)
+        actions[12].setChecked(self.usesManyTabs)
+
+        for name, config in DOCKER_PADS.items():
+            if 'menuText' in config:
+                action = window.createAction(config['menuText'], config['menuText'], "")
+                action.setCheckable(True)
+                action.setChecked(self.usesDockerPad[name])
+                action.toggled.connect(lambda toggled, name=name: self.dockerPadToggled(name, toggled))
+                actions.append(action)
+
+        action = window.createAction("padPaintingStats", "Pad Painting Statistics...", "")
+        action.triggered.connect(self.showPaintingStats)
+        actions.append(action)
+
+        action = window.createAction("themeOverrides", "Theme Overrides...", "")
+        action.triggered.connect(self.showThemeOverrides)
+        actions.append(action)
+
         menu = window.qwindow().menuBar().addMenu("Redesign")
 
         for a in actions:
@@ -85,8 +204,27 @@ class Redesign(Extension):
         actions[2].toggled.connect(self.flatThemeToggled)
         actions[3].toggled.connect(self.nuToolboxToggled)
         actions[4].toggled.connect(self.nuToolOptionsToggled)
+        actions[5].toggled.connect(self.strokeAwarePadsToggled)
+        actions[6].toggled.connect(self.hidePadsWhilePaintingToggled)
+        actions[7].toggled.connect(self.nativeFlatThemeToggled)
+        actions[8].toggled.connect(self.performanceModeToggled)
+        actions[9].toggled.connect(self.autoPerformanceModeToggled)
+        actions[10].toggled.connect(self.focusModeHidesPadsToggled)
+        actions[11].toggled.connect(self.redesignColorsToggled)
+        actions[12].toggled.connect(self.manyTabsToggled)
+
+        # Before anything gets styled with the colors
+        if self.usesRedesignColors and not self.applyColorScheme(True):
+            # Saved off, or every launch and window would tell again
+            Application.writeSetting("Redesign", "usesRedesignColors", "false")
+            self.colorSchemeMissing()
+
+        self.updateTheme()
+
+        self.focusMode = ntFocusMode(window)
+        self.focusMode.hidesPads = self.focusModeHidesPads
 
-        variables.buildFlatTheme()
+        window.activeViewChanged.connect(self.activeViewChanged)
 
         if (self.usesNuToolOptions and
             Application.readSetting("", "ToolOptionsInDocker", "false") == "true"):
@@ -95,6 +233,10 @@ class Redesign(Extension):
         if self.usesNuToolbox: 
             self.ntTB = ntToolBox(window)
 
+        for name, uses in self.usesDockerPad.items():
+            if uses:
+                self.dockerPads[name] = ntDockerPad(window, name)
+
         self.rebuildStyleSheet(window.qwindow())
 
         #self.nuToolOptionsToggled(self.usesNuToolOptions)
@@ -115,6 +257,14 @@ class Redesign(Extension):
 
         self.rebuildStyleSheet(Application.activeWindow().qwindow())
 
+
+    def nativeFlatThemeToggled(self, toggled):
+        Application.writeSetting("Redesign", "usesNativeFlatTheme", str(toggled).lower())
+
+        self.usesNativeFlatTheme = toggled
+
+        self.rebuildStyleSheet(Application.activeWindow().qwindow())
+
     
     def tabHeightToggled(self, toggled):
         Application.instance().writeSetting("Redesign", "usesThinDocumentTabs", str(toggled).lower())
@@ -124,14 +274,20 @@ class Redesign(Extension):
         self.rebuildStyleSheet(Application.activeWindow().qwindow())
 
 
+    def manyTabsToggled(self, toggled):
+        Application.writeSetting("Redesign", "usesManyTabs", str(toggled).lower())
+
+        self.usesManyTabs = toggled
+
+        self.rebuildStyleSheet(Application.activeWindow().qwindow())
+
+
     def nuToolboxToggled(self, toggled):
         Application.writeSetting("Redesign", "usesNuToolbox", str(toggled).lower())
         self.usesNuToolbox = toggled
 
         if toggled:
             self.ntTB = ntToolBox(Application.activeWindow())
-            self.ntTB.pad.show() 
-            self.ntTB.updateStyleSheet()
         elif not toggled and self.ntTB:
             self.ntTB.close()
             self.ntTB = None
@@ -143,8 +299,6 @@ class Redesign(Extension):
 
             if toggled:
                 self.ntTO = ntToolOptions(Application.activeWindow())
-                self.ntTO.pad.show() 
-                self.ntTO.updateStyleSheet()
             elif not toggled and self.ntTO:
                 self.ntTO.close()
                 self.ntTO = None
@@ -155,56 +309,223 @@ class Redesign(Extension):
                         "Once the setting has been changed, please restart Krita.")
             msg.exec_()
 
+    def strokeAwarePadsToggled(self, toggled):
+        Application.writeSetting("Redesign", "usesStrokeAwarePads", str(toggled).lower())
+        self.usesStrokeAwarePads = toggled
+        self.updateStrokeFilter()
+
+    def hidePadsWhilePaintingToggled(self, toggled):
+        Application.writeSetting("Redesign", "hidesPadsWhilePainting", str(toggled).lower())
+        self.hidesPadsWhilePainting = toggled
+        ntStrokeFilter.hidePads = toggled
+
+    def performanceModeToggled(self, toggled):
+        Application.writeSetting("Redesign", "usesPerformanceMode", str(toggled).lower())
+        self.usesPerformanceMode = toggled
+
+        self.updateStrokeFilter()
+        self.rebuildStyleSheet(Application.activeWindow().qwindow())
+
+    def autoPerformanceModeToggled(self, toggled):
+        Application.writeSetting("Redesign", "usesAutoPerformanceMode", str(toggled).lower())
+        self.usesAutoPerformanceMode = toggled
+
+        self.activeViewChanged()
+
+    def focusModeHidesPadsToggled(self, toggled):
+        Application.writeSetting("Redesign", "focusModeHidesPads", str(toggled).lower())
+        self.focusModeHidesPads = toggled
+
+        if self.focusMode:
+            self.focusMode.hidesPads = toggled
+
+    def redesignColorsToggled(self, toggled):
+        if not self.applyColorScheme(toggled):
+            self.colorSchemeMissing()
+            return
+
+        Application.writeSetting("Redesign", "usesRedesignColors", str(toggled).lower())
+        self.usesRedesignColors = toggled
+
+        self.updateTheme()
+        self.rebuildStyleSheet(Application.activeWindow().qwindow())
+
+    def activeViewChanged(self):
+        """Engage performance mode when switching to a document larger than
+        performanceModePixels, and disengage it when switching to a smaller one."""
+        doc = Application.activeDocument()
+        engage = bool(self.usesAutoPerformanceMode and doc and
+                      doc.width() * doc.height() > self.performanceModePixels)
+
+        if engage == self.autoPerformanceEngaged:
+            return
+
+        wasActive = self.usesPerformanceMode or self.autoPerformanceEngaged
+        self.autoPerformanceEngaged = engage
+        self.updateStrokeFilter()
+
+        if wasActive != self.usesPerformanceStyle() and Application.activeWindow():
+            self.rebuildStyleSheet(Application.activeWindow().qwindow())
+
+    def usesPerformanceStyle(self):
+        return self.usesPerformanceMode or self.autoPerformanceEngaged
+
+    def updateStrokeFilter(self):
+        # Performance mode always pauses the Pads while painting
+        ntStrokeFilter.enabled = self.usesStrokeAwarePads or self.usesPerformanceStyle()
+
+    def showPaintingStats(self):
+        """Show what pausing (and hiding) the Pads saved while painting in the active window."""
+        mdiArea = ntWidgetLocator.forWindow(Application.activeWindow().qwindow()).find(QMdiArea)
+
+        msg = QMessageBox()
+        msg.setWindowTitle("Pad Painting Statistics")
+        msg.setText(ntStrokeFilter.forMdiArea(mdiArea).report() if mdiArea else "No canvas found.")
+        msg.exec()
+
+    def dockerPadToggled(self, name, toggled):
+        Application.writeSetting("Redesign", f"uses{DOCKER_PADS[name]['menuText']}", str(toggled).lower())
+        self.usesDockerPad[name] = toggled
+
+        if toggled:
+            self.dockerPads[name] = ntDockerPad(Application.activeWindow(), name)
+        elif name in self.dockerPads:
+            self.dockerPads.pop(name).close()
+
+
+    def applyColorScheme(self, enabled):
+        """
+        Switch the application to the bundled KritaRedesign color scheme, or 
+        back to the palette it had before. The style templates follow with
+        updateTheme(). Returns False if the scheme isn't found."""
+        app = QApplication.instance()
+
+        if enabled:
+            path = colorscheme.findScheme(self.colorSchemeDirs())
+            if not path:
+                return False
+
+            if not self.originalPalette:
+                self.originalPalette = QPalette(app.palette())
+
+            app.setPalette(colorscheme.loadScheme(path)['palette'])
+        elif self.originalPalette:
+            app.setPalette(self.originalPalette)
+            self.originalPalette = None
+
+        return True
+
+    def updateTheme(self):
+        """
+        Build the style templates from the application palette's colors and
+        the built-in metrics, with the user's overrides layered on top."""
+        theme = colorscheme.colorsFromPalette(QApplication.instance().palette())
+        theme.update(variables.DEFAULT_METRICS)
+
+        if self.themeWatcher:
+            theme.update(self.themeWatcher.overrides)
+
+        variables.setTheme(theme)
+
+    def themeOverridesChanged(self, overrides):
+        self.updateTheme()
+
+        if Application.activeWindow():
+            self.rebuildStyleSheet(Application.activeWindow().qwindow())
+
+    def showThemeOverrides(self):
+        """Show which theme overrides are in use, or why the file is ignored."""
+        path = self.themeWatcher.path
+        overrides = self.themeWatcher.overrides
+
+        if self.themeWatcher.error:
+            text = f"{path} is ignored: {self.themeWatcher.error}"
+            if overrides:
+                text += "\n\nThe last good overrides stay in use."
+        elif overrides:
+            text = f"{path} overrides:\n\n" + "\n".join(f"{name}: {value}" for name, value in overrides.items())
+        else:
+            text = f"No overrides in use. Create {path} to override the theme, see the README."
+
+        msg = QMessageBox()
+        msg.setWindowTitle("Theme Overrides")
+        msg.setText(text)
+        msg.exec()
+
+    def colorSchemeMissing(self):
+        """
+        Turn the color scheme option back off and tell the user where the
+        scheme was looked for."""
+        self.usesRedesignColors = False
+
+        if self.redesignColorsAction:
+            self.redesignColorsAction.blockSignals(True)
+            self.redesignColorsAction.setChecked(False)
+            self.redesignColorsAction.blockSignals(False)
+
+        msg = QMessageBox()
+        msg.setWindowTitle("Redesign Color Scheme")
+        msg.setText(f"{colorscheme.SCHEME_NAME} wasn't found. It's looked for in:\n\n" +
+                    "\n".join(self.colorSchemeDirs()))
+        msg.exec()
+
+    def colorSchemeDirs(self):
+        """Where KritaRedesign.colors is looked for: Krita's color schemes, 
+        then the plugin folder and the one above it (a checkout of the repository)."""
+        pluginDir = os.path.dirname(os.path.abspath(__file__))
+        return [
+            os.path.join(Application.getAppDataLocation(), "color-schemes"),
+            pluginDir,
+            os.path.dirname(pluginDir)
+        ]
+
+
+    def applyNativeFlatStyle(self, enabled):
+        """
+        Install the flat theme as a proxy over Krita's current style, or 
+        restore the original style."""
+        app = QApplication.instance()
+
+        if enabled:
+            if not isinstance(app.style(), FlatStyle):
+                self.flatStyle = FlatStyle(app.style().name(), variables.colors(),
+                                           self.usesThinDocumentTabs, variables.small_tab_size)
+                self.flatStyle.setRadius(variables.radius)
+                app.setStyle(self.flatStyle)
+            else:
+                # Already installed, the widgets need to catch up with the changes
+                self.flatStyle.setColors(variables.colors())
+                self.flatStyle.setRadius(variables.radius)
+                self.flatStyle.setThinTabs(self.usesThinDocumentTabs, variables.small_tab_size)
+                self.flatStyle.refresh()
+        elif self.flatStyle:
+            app.setStyle(self.flatStyle.baseStyleName)
+            self.flatStyle = None
+
 
     def rebuildStyleSheet(self, window):
-        full_style_sheet = ""
-        
-        # Dockers
-        if self.usesFlatTheme:
-            full_style_sheet += f"\n {variables.flat_dock_style} \n"
-            full_style_sheet += f"\n {variables.flat_button_style} \n"
-            full_style_sheet += f"\n {variables.flat_main_window_style} \n"
-            full_style_sheet += f"\n {variables.flat_menu_bar_style} \n"
-            full_style_sheet += f"\n {variables.flat_combo_box_style} \n"
-            full_style_sheet += f"\n {variables.flat_status_bar_style} \n"
-            full_style_sheet += f"\n {variables.flat_tree_view_style} \n"
-
-        # Toolbar
-        if self.usesFlatTheme:
-            full_style_sheet += f"\n {variables.flat_toolbar_style} \n"
-        elif self.usesBorderlessToolbar:
-            full_style_sheet += f"\n {variables.no_borders_style} \n"    
-        
-        window.setStyleSheet(full_style_sheet)
+        # In native mode the flat theme is drawn by FlatStyle instead of style sheets
+        native = self.usesFlatTheme and self.usesNativeFlatTheme
+        self.applyNativeFlatStyle(native)
 
-        #print("\n\n")
-        #print(full_style_sheet)
-        #print("\n\n")
+        sheets = stylecache.styleSheets(
+            self.usesFlatTheme and not native,
+            self.usesBorderlessToolbar and not native,
+            self.usesThinDocumentTabs and not native,
+            self.usesPerformanceStyle(),
+            self.usesManyTabs)
 
-        # Overview
-        overview = window.findChild(QWidget, 'OverviewDocker')
-        overview_style = ""
+        # Dockers and toolbar
+        window.setStyleSheet(sheets['main'])
 
-        if self.usesFlatTheme:
-            overview_style += f"\n {variables.flat_overview_docker_style} \n"
+        # Overview
+        overview = ntWidgetLocator.forWindow(window).find(QWidget, 'OverviewDocker')
 
         if overview:
-            overview.setStyleSheet(overview_style)
+            overview.setStyleSheet(sheets['overview'])
 
         # For document tab
-        canvas_style_sheet = ""
-
-        if self.usesFlatTheme:
-            # Keep tab styling local to the canvas/doc area. Applying it
-            # globally affects dock/tab containers in Krita 5+.
-            canvas_style_sheet += f"\n {variables.flat_tab_base_style} \n"
-            if self.usesThinDocumentTabs:
-                canvas_style_sheet += f"\n {variables.flat_tab_small_style} \n"
-            else: 
-                canvas_style_sheet += f"\n {variables.flat_tab_big_style} \n"
-        else: 
-            if self.usesThinDocumentTabs:
-                canvas_style_sheet += f"\n {variables.small_tab_style} \n"
+        canvas_style_sheet = sheets['canvas']
 
         canvas = window.centralWidget()
         canvas.setStyleSheet(canvas_style_sheet)
@@ -221,4 +542,7 @@ class Redesign(Extension):
         if self.usesNuToolbox and self.ntTB:
             self.ntTB.updateStyleSheet()  
 
+        for pad in self.dockerPads.values():
+            pad.updateStyleSheet()
+
 Krita.instance().addExtension(Redesign(Krita.instance()))
@@ -0,0 +1,216 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from krita import Krita
+from PyQt6.QtCore import QStandardPaths
+from . import variables
+from . import qssoptimizer
+from .nuTools import ntpadconfig
+
+# Compiled style sheets are kept on disk so Krita can start without
+# rebuilding them. Entries are keyed by everything that goes into them:
+# the sources of the templates, Krita's version, the theme slots (palette
+# colors and metrics) and the flags.
+
+MAX_ENTRIES = 16
+
+_sourceHash = None
+_memory = {}
+
+# The sheets currently applied, by name ('main', 'overview', 'canvas', 'pad')
+current = {}
+
+
+def cacheDir():
+    """Directory the compiled style sheets are stored in."""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(base, "krita-redesign")
+
+
+def sourceHash():
+    """Hash of the size and modification time of the files the style sheets
+    are compiled from, stands in for the plugin version. Computed once per
+    session, without reading the files."""
+    global _sourceHash
+
+    if not _sourceHash:
+        h = hashlib.sha1()
+        for path in (variables.__file__, qssoptimizer.__file__, ntpadconfig.__file__, __file__):
+            stat = os.stat(path)
+            h.update(f"{stat.st_size}:{stat.st_mtime_ns};".encode())
+        h.update(Krita.instance().version().encode())
+        _sourceHash = h.hexdigest()[:12]
+
+    return _sourceHash
+
+
+def cacheKey(flags):
+    slots = tuple(variables.theme().values())
+    h = hashlib.sha1(repr((slots, tuple(flags))).encode())
+    return f"{sourceHash()}-{h.hexdigest()[:16]}"
+
+
+def compileStyleSheets(usesFlatTheme, usesBorderlessToolbar, usesThinDocumentTabs, usesPerformanceMode=False, usesManyTabs=False):
+    """
+    Build the main window, overview, canvas and pad style sheets for the given flags.
+    In performance mode pads are opaque and universal selectors are left out.
+    With many tabs the document tabs get a fixed width."""
+    if usesFlatTheme and not variables.flat_dock_style:
+        variables.buildFlatTheme()
+
+    full_style_sheet = ""
+
+    # Dockers
+    if usesFlatTheme:
+        full_style_sheet += f"\n {variables.flat_dock_style} \n"
+        full_style_sheet += f"\n {variables.flat_button_style} \n"
+        full_style_sheet += f"\n {variables.flat_main_window_style} \n"
+        full_style_sheet += f"\n {variables.flat_menu_bar_style} \n"
+        full_style_sheet += f"\n {variables.flat_combo_box_style} \n"
+        full_style_sheet += f"\n {variables.flat_status_bar_style} \n"
+        full_style_sheet += f"\n {variables.flat_tree_view_style} \n"
+
+    # Toolbar
+    if usesFlatTheme:
+        full_style_sheet += f"\n {variables.flat_toolbar_style} \n"
+    elif usesBorderlessToolbar:
+        full_style_sheet += f"\n {variables.no_borders_style} \n"
+
+    # Overview
+    overview_style = ""
+
+    if usesFlatTheme and not usesPerformanceMode:
+        overview_style += f"\n {variables.flat_overview_docker_style} \n"
+
+    # For document tab
+    canvas_style_sheet = ""
+
+    if usesFlatTheme:
+        # Keep tab styling local to the canvas/doc area. Applying it
+        # globally affects dock/tab containers in Krita 5+.
+        canvas_style_sheet += f"\n {variables.flat_tab_base_style} \n"
+        if usesThinDocumentTabs:
+            canvas_style_sheet += f"\n {variables.flat_tab_small_style} \n"
+        else:
+            canvas_style_sheet += f"\n {variables.flat_tab_big_style} \n"
+    else:
+        if usesThinDocumentTabs:
+            canvas_style_sheet += f"\n {variables.small_tab_style} \n"
+
+    # Last, so it wins over the expanding flat tabs
+    if usesManyTabs:
+        canvas_style_sheet += f"\n {variables.many_tabs_style} \n"
+
+    # One sheet shared by all Pads, its rules scoped by objectName
+    pad_style = variables.nu_toolbox_opaque_style if usesPerformanceMode else variables.nu_toolbox_style
+    pad_style_sheet = ""
+
+    for config in ntpadconfig.DOCKER_PADS.values():
+        if config['styled']:
+            pad_style_sheet += qssoptimizer.scopeSheet(pad_style, f"#{config['padName']}") + "\n"
+
+    # Last, so it wins over the Pad rules of the same specificity
+    pad_style_sheet += qssoptimizer.scopeSheet(variables.nu_toggle_button_style, "#padToggleButton", descendants=False)
+
+    sheets = {
+        'main': full_style_sheet,
+        'overview': overview_style,
+        'canvas': canvas_style_sheet,
+        'pad': pad_style_sheet
+    }
+
+    if usesPerformanceMode:
+        sheets = {name: qssoptimizer.dropUniversalRules(sheet) for name, sheet in sheets.items()}
+
+    # Drop redundant universal parts of selectors, e.g. `* > QSpinBox`
+    return {name: qssoptimizer.optimizeSheet(sheet)[0] for name, sheet in sheets.items()}
+
+
+def styleSheets(usesFlatTheme, usesBorderlessToolbar, usesThinDocumentTabs, usesPerformanceMode=False, usesManyTabs=False):
+    """
+    Get the compiled style sheets for the given flags, from memory or disk if
+    possible, compiling and storing them otherwise. They also become the current ones."""
+    global current
+
+    flags = (usesFlatTheme, usesBorderlessToolbar, usesThinDocumentTabs, usesPerformanceMode, usesManyTabs)
+    key = cacheKey(flags)
+
+    sheets = _memory.get(key) or readEntry(key)
+
+    if not sheets:
+        sheets = compileStyleSheets(*flags)
+        writeEntry(key, sheets)
+
+    _memory[key] = sheets
+    current = sheets
+    return sheets
+
+
+def readEntry(key):
+    try:
+        with open(os.path.join(cacheDir(), f"{key}.json"), 'r', encoding='utf-8') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def writeEntry(key, sheets):
+    """Atomically store the sheets, then evict stale entries."""
+    directory = cacheDir()
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmpPath = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(sheets, f)
+        os.replace(tmpPath, os.path.join(directory, f"{key}.json"))
+
+        evictEntries(directory)
+    except OSError:
+        pass # Not being able to cache is no reason to fail styling
+
+
+def evictEntries(directory):
+    """Remove entries compiled from other sources, and the oldest ones beyond MAX_ENTRIES."""
+    entries = []
+
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+
+        if not name.startswith(sourceHash() + "-"):
+            os.remove(path)
+        else:
+            entries.append((os.path.getmtime(path), path))
+
+    entries.sort(reverse=True)
+    for _, path in entries[MAX_ENTRIES:]:
+        os.remove(path)
+
+
+def clear():
+    """Drop all cached style sheets, in memory and on disk."""
+    _memory.clear()
+
+    directory = cacheDir()
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
@@ -0,0 +1,137 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+import os
+import re
+import json
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from . import variables
+
+# User overrides of the theme, layered onto the built-in style templates.
+# A JSON file in Krita's resource folder with any of the slots of variables:
+#
+#     {
+#         "highlight": "#3daee9",
+#         "background": "#2b2b2b",
+#         "radius": 6,
+#         "small_tab_size": 18
+#     }
+
+OVERRIDES_NAME = "krita-redesign-theme.json"
+
+# Saves within this many ms of each other only reload the theme once
+DEBOUNCE_MS = 300
+
+_COLOR = re.compile(r'^#?[0-9a-fA-F]{6}$')
+
+
+def readOverrides(path):
+    """
+    Read and validate an overrides file. Returns a dict of slots, empty if
+    the file doesn't exist. Raises ValueError if the file is broken."""
+    if not os.path.isfile(path):
+        return {}
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    if not isinstance(data, dict):
+        raise ValueError("expected an object of theme slots")
+
+    for name, value in data.items():
+        if name in variables.COLOR_SLOTS:
+            if not isinstance(value, str) or not _COLOR.match(value):
+                raise ValueError(f"{name}: expected a color like \"#3daee9\", got {value!r}")
+        elif name in variables.METRIC_SLOTS:
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"{name}: expected a size in pixels, got {value!r}")
+        else:
+            raise ValueError(f"unknown slot {name!r}")
+
+    return data
+
+
+class ThemeWatcher(QObject):
+    """
+    Watches the overrides file and emits `changed` with the new overrides,
+    once per burst of saves. A broken file is ignored, the last good
+    overrides (and thus the sheets compiled from them) stay in use. Its
+    error is kept in `error`, and emitted with `failed` when it's saved."""
+
+    changed = pyqtSignal(dict)
+    failed = pyqtSignal(str)
+
+    def __init__(self, path, parent=None):
+        super(ThemeWatcher, self).__init__(parent)
+        self.path = path
+        self.overrides = {}
+        self.error = None
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE_MS)
+        self.timer.timeout.connect(self.reload)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.scheduleReload)
+        self.watcher.directoryChanged.connect(self.scheduleReload)
+
+        self.watch()
+        self.load()
+
+    def watch(self):
+        """
+        Watch the file, and its folder to notice it being created. Editors
+        that save by replacing the file drop it from the watcher, so this is
+        repeated on every reload."""
+        directory = os.path.dirname(self.path)
+
+        if os.path.isdir(directory) and directory not in self.watcher.directories():
+            self.watcher.addPath(directory)
+
+        if os.path.isfile(self.path) and self.path not in self.watcher.files():
+            self.watcher.addPath(self.path)
+
+    def scheduleReload(self, path=None):
+        # (Re)starting the timer coalesces a burst of saves
+        self.timer.start()
+
+    def load(self):
+        """
+        Read the file into `overrides`, unless it's broken.
+        Returns True if the overrides changed."""
+        try:
+            overrides = readOverrides(self.path)
+        except (OSError, ValueError) as e:
+            self.error = str(e)
+            return False
+
+        self.error = None
+
+        if overrides == self.overrides:
+            return False
+
+        self.overrides = overrides
+        return True
+
+    def reload(self):
+        self.watch()
+
+        if self.load():
+            self.changed.emit(self.overrides)
+        elif self.error:
+            self.failed.emit(self.error)
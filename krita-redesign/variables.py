@@ -15,7 +15,6 @@
     along with this program.  If not, see <https://www.gnu.org/licenses/>.
 """
 
-from krita import *
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QPalette
 
@@ -26,67 +25,164 @@ inactive_text_color = QApplication.instance().palette().color(QPalette.ColorRole
 active_text_color = QApplication.instance().palette().color(QPalette.ColorRole.WindowText).name().split("#")[1]
 
 small_tab_size = 20
+many_tab_width = 160
+radius = 4
 
-no_borders_style = " QToolBar { border: none; } "
-nu_toolbox_style = f"""
-            QWidget {{ 
-                background-color: #01{alternate};
-            }}
+COLOR_SLOTS = ('highlight', 'background', 'alternate', 'inactive_text_color', 'active_text_color')
+METRIC_SLOTS = ('small_tab_size', 'many_tab_width', 'radius')
+
+# Built-in metrics, for when no (more) overrides apply
+DEFAULT_METRICS = {'small_tab_size': small_tab_size, 'many_tab_width': many_tab_width, 'radius': radius}
+
+def colors():
+    """The stylesheet color slots, as hex strings without the '#'."""
+    return {name: globals()[name] for name in COLOR_SLOTS}
+
+
+def theme():
+    """Every slot the style templates are built from, colors and metrics."""
+    return {name: globals()[name] for name in COLOR_SLOTS + METRIC_SLOTS}
+
+
+def setTheme(values):
+    """
+    Replace (some of) the color and metric slots and rebuild the style templates.
+    The flat theme is rebuilt the next time it's needed."""
+    global flat_dock_style
+
+    for name in COLOR_SLOTS:
+        if name in values:
+            globals()[name] = values[name].lstrip('#')
+
+    for name in METRIC_SLOTS:
+        if name in values:
+            globals()[name] = int(values[name])
+
+    buildStyles()
+    flat_dock_style = "" # Marks the flat theme as stale, see stylecache.compileStyleSheets()
+
+
+no_borders_style = ""
+nu_toolbox_style = ""
+nu_toolbox_opaque_style = ""
+nu_toggle_button_style = ""
+nu_scroll_area_style = ""
+small_tab_style = ""
+many_tabs_style = ""
+
+def buildStyles():
+    """Build the style templates that don't depend on the flat theme from the current colors."""
+    global no_borders_style
+    global nu_toolbox_style
+    global nu_toolbox_opaque_style
+    global nu_toggle_button_style
+    global nu_scroll_area_style
+    global small_tab_style
+    global many_tabs_style
+
+    no_borders_style = " QToolBar { border: none; } "
+    nu_toolbox_style = f"""
+                QWidget {{ 
+                    background-color: #01{alternate};
+                }}
             
-            .QScrollArea {{ 
-                background-color: #00{background};
-            }}
+                .QScrollArea {{ 
+                    background-color: #00{background};
+                }}
             
-            QScrollArea * {{ 
-                background-color: #00000000;
-            }}
+                QScrollArea * {{ 
+                    background-color: #00000000;
+                }}
             
-            QScrollArea QToolTip {{
-                background-color: #{active_text_color};                         
-            }}
+                QScrollArea QToolTip {{
+                    background-color: #{active_text_color};                         
+                }}
+            
+                QAbstractButton {{
+                    background-color: #aa{background};
+                    border: none;
+                    border-radius: {radius}px;
+                }}
+            
+                QAbstractButton:checked {{
+                    background-color: #cc{highlight};
+                }}
+            
+                QAbstractButton:hover {{
+                    background-color: #{highlight};
+                }}
+            
+                QAbstractButton:pressed {{
+                    background-color: #{alternate};
+                }}
+            """
+    # Opaque pad style for performance mode: no translucency to blend with
+    # the canvas underneath, and no universal selectors
+    nu_toolbox_opaque_style = f"""
+                QWidget {{ 
+                    background-color: #{alternate};
+                }}
+            
+                QToolTip {{
+                    background-color: #{active_text_color};                         
+                }}
+            
+                QAbstractButton {{
+                    background-color: #{background};
+                    border: none;
+                    border-radius: {radius}px;
+                }}
+            
+                QAbstractButton:checked {{
+                    background-color: #{highlight};
+                }}
+            
+                QAbstractButton:hover {{
+                    background-color: #{highlight};
+                }}
             
-            QAbstractButton {{
+                QAbstractButton:pressed {{
+                    background-color: #{alternate};
+                }}
+            """
+    nu_toggle_button_style = f"""
+            QToolButton {{
                 background-color: #aa{background};
                 border: none;
-                border-radius: 4px;
+                border-radius: {radius}px;
             }}
-            
-            QAbstractButton:checked {{
-                background-color: #cc{highlight};
-            }}
-            
-            QAbstractButton:hover {{
+        
+            QToolButton:hover {{
                 background-color: #{highlight};
             }}
-            
-            QAbstractButton:pressed {{
+        
+            QToolButton:pressed {{
                 background-color: #{alternate};
             }}
-        """
-nu_toggle_button_style = f"""
-        QToolButton {{
-            background-color: #aa{background};
-            border: none;
-            border-radius: 4px;
-        }}
-        
-        QToolButton:hover {{
-            background-color: #{highlight};
-        }}
-        
-        QToolButton:pressed {{
-            background-color: #{alternate};
-        }}
-        """
+            """
 
-nu_scroll_area_style = f"""
-        QScrollArea {{ 
-            background-color: red;
-            color: red;
-        }}
+    nu_scroll_area_style = f"""
+            QScrollArea {{ 
+                background-color: red;
+                color: red;
+            }}
             
-        """
-small_tab_style = f"QTabBar::tab {{ height: {small_tab_size}px; }}"
+            """
+    small_tab_style = f"QTabBar::tab {{ height: {small_tab_size}px; }}"
+
+    # For sessions with many documents: fixed width tabs don't depend on each 
+    # other, so opening or closing a document doesn't resize all the others
+    many_tabs_style = f"""
+        QTabBar {{
+            qproperty-expanding: 0;
+            qproperty-usesScrollButtons: 1;
+            qproperty-elideMode: 1;
+        }}
+
+        QTabBar::tab {{
+            width: {many_tab_width}px;
+        }}"""
+
 
 """ FLAT THEME """
 
@@ -128,7 +224,7 @@ def buildFlatTheme():
         * > QSpinBox {{
             border: none;
             background-color: #{alternate};
-            border-radius: 4px;
+            border-radius: {radius}px;
         }}    
     """
 
@@ -174,15 +270,15 @@ def buildFlatTheme():
        }}
        """
     flat_tab_big_style = f"""QTabBar::tab {{
-            border-top-right-radius: 4px;
-            border-top-left-radius: 4px;
+            border-top-right-radius: {radius}px;
+            border-top-left-radius: {radius}px;
         }}"""
     flat_tab_small_style = f""" 
         QTabBar::tab {{
             border-top:0px;
             border-bottom: 0px;
-            border-top-right-radius: 4px;
-            border-top-left-radius: 4px;
+            border-top-right-radius: {radius}px;
+            border-top-left-radius: {radius}px;
             height: {small_tab_size}px;
         }}"""
 
@@ -230,7 +326,7 @@ def buildFlatTheme():
 
         QPushButton {{
             background: #{background};
-            border-radius: 4px;
+            border-radius: {radius}px;
             border: 2px solid #{alternate};
         }}
         
@@ -245,8 +341,8 @@ def buildFlatTheme():
         QDockWidget {{
             titlebar-close-icon: url(:/light_deletelayer.svg);
             titlebar-normal-icon: url(:/light_duplicatelayer.svg);
-            border-bottom-right-radius: 4px;
-            border-bottom-left-radius: 4px;
+            border-bottom-right-radius: {radius}px;
+            border-bottom-left-radius: {radius}px;
         }}
 
         QDockWidget::close-button {{
@@ -262,8 +358,8 @@ def buildFlatTheme():
         QDockWidget > * {{
             background-color: #{background};
             border: none;
-            border-bottom-right-radius: 4px;
-            border-bottom-left-radius: 4px;
+            border-bottom-right-radius: {radius}px;
+            border-bottom-left-radius: {radius}px;
             titlebar-close-icon: url(/:16_dark_tab-close.svg);
         }}
 
@@ -285,7 +381,7 @@ def buildFlatTheme():
     flat_combo_box_style = f"""QComboBox {{ 
             background: #{background};
             border-bottom: 2px solid #{inactive_text_color};
-            border-radius: 4px;
+            border-radius: {radius}px;
             padding-left: 10px;
             padding-right: 10px;
             padding-bottom: 2px;
@@ -298,7 +394,7 @@ def buildFlatTheme():
         
         QComboBox::drop-down {{
             border: none;
-            border-radius: 4px;
+            border-radius: {radius}px;
         }}
         
         QComboBox::down-arrow {{
@@ -312,3 +408,6 @@ def buildFlatTheme():
         border: none;
         padding: 5px;
     }}"""
+
+
+buildStyles()
@@ -0,0 +1,74 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Scores every selector of the flat theme by how many widgets Qt tests it
+# against and how many it matches, in an offscreen stand-in of Krita's window.
+# Universal selectors get a proposal of typed selectors styling the same
+# widgets, with the reduction of tested widgets that would bring.
+#
+#     python tools/analyze_selectors.py
+
+from PyQt6.QtWidgets import QWidget
+from offscreen import buildMainWindow, flatThemeSheets
+import qssoptimizer
+
+
+def scopes(window):
+    """The widgets each sheet applies to, by target."""
+    overview = window.findChild(QWidget, 'OverviewDocker')
+    toolbox = window.findChild(QWidget, 'ToolBox')
+
+    def subtree(root):
+        return [root] + root.findChildren(QWidget) if root else []
+
+    return {
+        'main': subtree(window),
+        'overview': subtree(overview),
+        'canvas': subtree(window.centralWidget()),
+        'pad': subtree(toolbox.widget() if toolbox else None)
+    }
+
+
+def run():
+    window = buildMainWindow()
+    sheets = flatThemeSheets()
+    totalBefore = 0
+    totalAfter = 0
+
+    for target, widgets in scopes(window).items():
+        print(f"\n== {target} ({len(widgets)} widgets) ==")
+        print(f"{'tested':>8}{'matched':>9}  selector")
+
+        for selector, tested, matched in qssoptimizer.scoreSheet(sheets[target], widgets):
+            print(f"{tested:>8}{matched:>9}  {selector}")
+            totalBefore += tested
+
+            proposals = qssoptimizer.proposeSelectors(selector, widgets)
+            if proposals == [selector]:
+                totalAfter += tested
+                continue
+
+            proposedTested = sum(len(qssoptimizer.testedWidgets(widgets, p)) for p in proposals)
+            totalAfter += proposedTested
+            print(f"{'':>17}-> {', '.join(proposals) or '(matches nothing, drop it)'}"
+                  f"  [tested {tested} -> {proposedTested}]")
+
+    print(f"\nWidgets tested per full polish: {totalBefore} -> {totalAfter} with all proposals")
+
+
+if __name__ == '__main__':
+    run()
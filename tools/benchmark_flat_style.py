@@ -0,0 +1,53 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Compares the flat theme as style sheets against the native FlatStyle.
+#
+#     python tools/benchmark_flat_style.py [base style, default: Fusion]
+
+import sys
+from offscreen import app, buildMainWindow, applySheets, flatThemeSheets, colors, repolish, render, timeIt
+from flatstyle import FlatStyle
+
+
+def run(baseStyle):
+    window = buildMainWindow()
+    results = []
+
+    def measure(name, apply):
+        applyTime = timeIt(apply, repeat=1)
+        polishTime = timeIt(lambda: repolish(window))
+        paintTime = timeIt(lambda: render(window))
+        results.append((name, applyTime, polishTime, paintTime))
+
+    empty = {'main': "", 'overview': "", 'canvas': ""}
+
+    app.setStyle(baseStyle)
+    measure(f"{baseStyle} (no theme)", lambda: applySheets(window, empty))
+    measure("flat theme, style sheets", lambda: applySheets(window, flatThemeSheets()))
+
+    applySheets(window, empty)
+    measure("flat theme, native FlatStyle",
+            lambda: app.setStyle(FlatStyle(baseStyle, colors(), thinTabs=True)))
+
+    print(f"{'mode':<32}{'apply ms':>12}{'polish ms':>12}{'paint ms':>12}")
+    for name, applyTime, polishTime, paintTime in results:
+        print(f"{name:<32}{applyTime:>12.2f}{polishTime:>12.2f}{paintTime:>12.2f}")
+
+
+if __name__ == '__main__':
+    run(sys.argv[1] if len(sys.argv) > 1 else "Fusion")
@@ -0,0 +1,76 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+# Checks that the default Pads all keep a size in small Views, then times
+# solving the layout of a window's Pads for 1, 5 and 20 Pads. Exits with 1
+# if a default Pad comes out without a size.
+#
+#     python tools/benchmark_pad_layout.py [number of layouts per count, default: 10000]
+
+import sys
+import timeit
+from offscreen import pluginModule
+
+ntpadlayout = pluginModule('nuTools.ntpadlayout')
+
+MARGINS = (20, 0, 14, 14)
+
+# The default Pads (see ntpadconfig.DOCKER_PADS), with more Tool Options
+# than fit in one column: (key, alignment, stack order, width, height)
+DEFAULT_PADS = [
+    ('toolBoxPad', 'left', 0, 60, 700),
+    ('toolOptionsPad', 'right', 0, 250, 760),
+    ('layersPad', 'right', 1, 250, 400),
+    ('brushPresetsPad', 'bottomleft', 0, 300, 200),
+    ('colorSelectorPad', 'bottomright', 0, 250, 250)
+    ]
+
+
+def checkDefaultPads():
+    """Returns the Pads that come out without a size, by View size."""
+    failures = []
+
+    for size in ((1200, 800), (800, 500), (300, 200)):
+        layout = ntpadlayout.solveLayout(*size, DEFAULT_PADS, MARGINS)
+        for key, (x, y, w, h) in layout.items():
+            if w <= 0 or h <= 0:
+                failures.append((size, key, (x, y, w, h)))
+
+    return failures
+
+
+def run(runs):
+    failures = checkDefaultPads()
+    for size, key, geometry in failures:
+        print(f"{key} has no size in {size}: {geometry}")
+
+    if failures:
+        sys.exit(1)
+
+    print("default Pads keep their size")
+
+    for count in (1, 5, 20):
+        anchors = ntpadlayout.ANCHORS
+        pads = [(i, anchors[i % len(anchors)], i, 120, 240) for i in range(count)]
+        seconds = timeit.timeit(
+            lambda: ntpadlayout.solveLayout(1920, 1080, pads, MARGINS), number=runs)
+        print(f"{count:>3} pads: {seconds / runs * 1e6:8.2f} us per layout")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,78 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+# Measures how long opening and closing a document takes with many documents
+# open, with the flat theme's expanding tabs and with the fixed width tabs of
+# many_tabs_style, in an offscreen stand-in of Krita's window.
+#
+#     python tools/benchmark_tab_strip.py [number of opens/closes per size, default: 10]
+
+import sys
+import time
+import statistics
+from PyQt6.QtWidgets import QMdiArea
+from offscreen import app, buildMainWindow, applySheets, flatThemeSheets, addDocument
+import variables
+
+TAB_COUNTS = (10, 100, 500)
+
+
+def openAndClose(mdiArea, index):
+    """Open a document, then close it again. Returns both durations in ms."""
+    start = time.perf_counter()
+    subWin = addDocument(mdiArea, index)
+    app.processEvents()
+    opened = time.perf_counter()
+
+    subWin.close()
+    app.processEvents()
+    closed = time.perf_counter()
+
+    return (opened - start) * 1000, (closed - opened) * 1000
+
+
+def run(repeat):
+    print(f"median of {repeat} opens/closes, times in ms")
+    print(f"{'tabs':>6}  {'mode':<14}{'open':>10}{'close':>10}")
+
+    for tabCount in TAB_COUNTS:
+        window = buildMainWindow(tabCount)
+        mdiArea = window.findChild(QMdiArea)
+
+        for manyTabs in (False, True):
+            sheets = flatThemeSheets()
+            if manyTabs:
+                sheets['canvas'] += f"\n {variables.many_tabs_style} \n"
+
+            applySheets(window, sheets)
+            app.processEvents()
+
+            durations = [openAndClose(mdiArea, tabCount + i) for i in range(repeat)]
+            openTime = statistics.median(d[0] for d in durations)
+            closeTime = statistics.median(d[1] for d in durations)
+
+            name = "fixed width" if manyTabs else "expanding"
+            print(f"{tabCount:>6}  {name:<14}{openTime:>10.2f}{closeTime:>10.2f}")
+
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,114 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+
+# Counts how often document switches repolish the Pads' widgets. The Toolbox
+# and Tool Options Pads are real ntDockerPads borrowing the dockers of the
+# stand-in main window, styled with the sheets of stylecache, and every
+# switch goes through ntDockerPad.ensureFilterIsInstalled(). For comparison
+# the Pad sheets are also re-applied on every switch, like ntDockerPad used
+# to. A style sheet repolishes with a StyleChange event per widget (Polish
+# is only sent on first show), even if it's the same sheet again. Exits with
+# 1 if the Pads' own path repolishes at all, or if re-applying the sheets
+# doesn't (then the counter is broken).
+#
+#     python tools/count_pad_polish.py [number of document switches, default: 50]
+
+import sys
+from PyQt6.QtWidgets import QWidget, QMdiArea
+from PyQt6.QtCore import QObject, QEvent
+from offscreen import app, buildMainWindow, pluginModule, WindowStandIn
+
+stylecache = pluginModule('stylecache')
+ntdockerpad = pluginModule('nuTools.ntdockerpad')
+
+DOCKERS = ('ToolBox', 'sharedtooldocker')
+
+
+class PolishCounter(QObject):
+    """Counts Polish and StyleChange events of the widgets in the Pads."""
+
+    def __init__(self, pads):
+        super(PolishCounter, self).__init__()
+        self.pads = pads
+        self.count = 0
+
+    def eventFilter(self, obj, e):
+        if e.type() in (QEvent.Type.Polish, QEvent.Type.StyleChange) and isinstance(obj, QWidget):
+            if any(obj is pad or pad.isAncestorOf(obj) for pad in self.pads):
+                self.count += 1
+
+        return False
+
+
+def run(switches):
+    window = buildMainWindow(tabCount=10)
+    mdiArea = window.findChild(QMdiArea)
+    subWindows = mdiArea.subWindowList()
+
+    # What Redesign.rebuildStyleSheet() makes current, without the disk cache
+    stylecache.current = stylecache.compileStyleSheets(True, False, True)
+
+    dockerPads = [ntdockerpad.ntDockerPad(WindowStandIn(window), name) for name in DOCKERS]
+    pads = [dockerPad.pad for dockerPad in dockerPads]
+    app.processEvents()
+
+    print(f"{switches} document switches, {len(pads)} Pads")
+    print(f"{'mode':<28}{'repolishes':>15}{'per switch':>12}")
+
+    def reapplySheets():
+        for pad in pads:
+            pad.setStyleSheet(pad.styleSheet())
+
+    counts = {}
+
+    for reapply in (True, False):
+        if reapply:
+            mdiArea.subWindowActivated.connect(reapplySheets)
+
+        counter = PolishCounter(pads)
+        app.installEventFilter(counter)
+
+        for i in range(switches):
+            mdiArea.setActiveSubWindow(subWindows[i % len(subWindows)])
+            app.processEvents()
+
+        app.removeEventFilter(counter)
+
+        if reapply:
+            mdiArea.subWindowActivated.disconnect(reapplySheets)
+
+        name = "sheet applied per switch" if reapply else "ntDockerPad"
+        print(f"{name:<28}{counter.count:>15}{counter.count / switches:>12.1f}")
+        counts[reapply] = counter.count
+
+    for dockerPad in dockerPads:
+        dockerPad.close()
+
+    return counts[True], counts[False]
+
+
+if __name__ == '__main__':
+    reapplied, padPath = run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
+
+    if not reapplied:
+        print("FAIL: re-applying the sheets wasn't counted, the counter is broken")
+        sys.exit(1)
+
+    if padPath:
+        print("FAIL: document switches repolish the Pads")
+        sys.exit(1)
@@ -0,0 +1,303 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Shared helpers for the benchmarks and profilers in this folder. They run
+# outside of Krita, under Qt's offscreen platform, against a widget tree that
+# mimics the parts of Krita's main window the plugin styles. Plugin modules
+# that don't need Krita (variables, flatstyle, ...) are imported directly,
+# the others through pluginModule(), against a minimal stand-in for Krita.
+
+import os
+import sys
+import time
+import types
+import importlib
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QToolBar, QDockWidget, QWidget, QVBoxLayout,
+                             QGridLayout, QToolButton, QPushButton, QComboBox, QSpinBox, QTreeView,
+                             QMdiArea, QLabel, QScrollArea)
+from PyQt6.QtGui import QStandardItemModel, QStandardItem, QAction
+from PyQt6.QtCore import Qt, QObject, pyqtSignal
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+PLUGIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "krita-redesign")
+sys.path.insert(0, os.path.abspath(PLUGIN_DIR))
+
+import variables
+variables.buildFlatTheme()
+
+
+class KritaStandIn():
+    """
+    The few parts of Krita's API the nuTools and stylecache modules use
+    outside of the Extension: settings (always their defaults), the version
+    and the configuration notifier."""
+
+    class Notifier(QObject):
+        configurationChanged = pyqtSignal()
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if not cls._instance:
+            cls._instance = cls()
+            cls._instance._notifier = cls.Notifier()
+        return cls._instance
+
+    def notifier(self):
+        return self._notifier
+
+    def version(self):
+        return "offscreen"
+
+    def readSetting(self, group, name, default):
+        return default
+
+
+class WindowStandIn():
+    """A Krita Window with just what ntDockerPad needs."""
+
+    def __init__(self, window):
+        self.window = window
+
+    def qwindow(self):
+        return self.window
+
+    def createAction(self, name, text, menuLocation):
+        action = QAction(text, self.window)
+        action.setObjectName(name)
+        return action
+
+
+def pluginModule(name):
+    """
+    Import a plugin module that needs Krita, e.g. 'nuTools.ntdockerpad'.
+    The plugin is loaded as a package without running its __init__ (the
+    Extension), with KritaStandIn as the krita module."""
+    if 'krita' not in sys.modules:
+        krita = types.ModuleType('krita')
+        krita.Krita = KritaStandIn
+        sys.modules['krita'] = krita
+
+    if 'redesign_plugin' not in sys.modules:
+        package = types.ModuleType('redesign_plugin')
+        package.__path__ = [os.path.abspath(PLUGIN_DIR)]
+        sys.modules['redesign_plugin'] = package
+
+    return importlib.import_module(f"redesign_plugin.{name}")
+
+
+def colors():
+    """The palette colors of variables, as used by FlatStyle."""
+    return variables.colors()
+
+
+def styleBlocks():
+    """
+    Every style block of variables with the widget it's applied to in Krita:
+    'main' (the QMainWindow), 'overview', 'canvas' (the central widget) or 'pad'."""
+    return [
+        ('flat_dock_style', variables.flat_dock_style, 'main'),
+        ('flat_button_style', variables.flat_button_style, 'main'),
+        ('flat_main_window_style', variables.flat_main_window_style, 'main'),
+        ('flat_menu_bar_style', variables.flat_menu_bar_style, 'main'),
+        ('flat_combo_box_style', variables.flat_combo_box_style, 'main'),
+        ('flat_status_bar_style', variables.flat_status_bar_style, 'main'),
+        ('flat_tree_view_style', variables.flat_tree_view_style, 'main'),
+        ('flat_toolbar_style', variables.flat_toolbar_style, 'main'),
+        ('no_borders_style', variables.no_borders_style, 'main'),
+        ('flat_overview_docker_style', variables.flat_overview_docker_style, 'overview'),
+        ('flat_tab_base_style', variables.flat_tab_base_style, 'canvas'),
+        ('flat_tab_small_style', variables.flat_tab_small_style, 'canvas'),
+        ('flat_tab_big_style', variables.flat_tab_big_style, 'canvas'),
+        ('small_tab_style', variables.small_tab_style, 'canvas'),
+        ('many_tabs_style', variables.many_tabs_style, 'canvas'),
+        ('nu_toolbox_style', variables.nu_toolbox_style, 'pad'),
+    ]
+
+
+def flatThemeSheets(thinTabs=True):
+    """The sheets the flat theme applies, by target, the way rebuildStyleSheet combines them."""
+    sheets = {'main': "", 'overview': "", 'canvas': "", 'pad': ""}
+    skipped = ('no_borders_style', 'small_tab_style', 'many_tabs_style',
+               'flat_tab_big_style' if thinTabs else 'flat_tab_small_style')
+
+    for name, sheet, target in styleBlocks():
+        if name not in skipped:
+            sheets[target] += f"\n {sheet} \n"
+
+    return sheets
+
+
+class KoToolBoxScrollArea(QScrollArea):
+    """Krita's toolbox docker widget is a QScrollArea subclass of this name."""
+
+
+def buildMainWindow(tabCount=20):
+    """
+    Build a stand-in for Krita's main window: menu and status bars, toolbars,
+    dock widgets (incl. a toolbox of tool buttons, an overview with spin boxes
+    and a tree view) and an MDI area in tabbed mode with `tabCount` documents."""
+    window = QMainWindow()
+    window.resize(1600, 1000)
+
+    for m in ("File", "Edit", "View", "Image", "Layer", "Select", "Filter", "Settings"):
+        menu = window.menuBar().addMenu(m)
+        for i in range(10):
+            menu.addAction(f"{m} action {i}")
+
+    for t in range(2):
+        toolbar = QToolBar(f"Toolbar {t}")
+        for i in range(15):
+            toolbar.addAction(QAction(f"T{t}{i}", toolbar))
+        toolbar.addWidget(QComboBox())
+        window.addToolBar(toolbar)
+
+    # Toolbox, in a scroll area like Krita's (KoToolBoxScrollArea)
+    toolbox = QDockWidget("Toolbox")
+    toolbox.setObjectName("ToolBox")
+    toolboxWidget = QWidget()
+    grid = QGridLayout(toolboxWidget)
+    for i in range(48):
+        button = QToolButton()
+        button.setCheckable(True)
+        button.setText(str(i))
+        grid.addWidget(button, i // 2, i % 2)
+    toolboxScrollArea = KoToolBoxScrollArea()
+    toolboxScrollArea.setWidget(toolboxWidget)
+    toolbox.setWidget(toolboxScrollArea)
+    window.addDockWidget(Qt.DockWidgetArea.LeftDockWidgetArea, toolbox)
+
+    # Tool options, in a scroll area like Krita's
+    options = QDockWidget("Tool Options")
+    options.setObjectName("sharedtooldocker")
+    optionsWidget = QWidget()
+    optionsLayout = QVBoxLayout(optionsWidget)
+    for i in range(8):
+        combo = QComboBox()
+        combo.addItems([f"Option {j}" for j in range(10)])
+        optionsLayout.addWidget(combo)
+        optionsLayout.addWidget(QSpinBox())
+        optionsLayout.addWidget(QPushButton(f"Button {i}"))
+    scrollArea = QScrollArea()
+    scrollArea.setWidget(optionsWidget)
+    options.setWidget(scrollArea)
+    window.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, options)
+
+    # Overview
+    overview = QDockWidget("Overview")
+    overview.setObjectName("OverviewDocker")
+    overviewWidget = QWidget()
+    overviewLayout = QVBoxLayout(overviewWidget)
+    overviewLayout.addWidget(QLabel("Preview"))
+    for i in range(3):
+        overviewLayout.addWidget(QSpinBox())
+    overview.setWidget(overviewWidget)
+    window.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, overview)
+
+    # Layers
+    layers = QDockWidget("Layers")
+    layers.setObjectName("KisLayerBox")
+    tree = QTreeView()
+    model = QStandardItemModel(tree)
+    for i in range(50):
+        item = QStandardItem(f"Layer {i}")
+        for j in range(4):
+            item.appendRow(QStandardItem(f"Child {j}"))
+        model.appendRow(item)
+    tree.setModel(model)
+    tree.expandAll()
+    layers.setWidget(tree)
+    window.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, layers)
+
+    # Documents
+    mdiArea = QMdiArea()
+    mdiArea.setViewMode(QMdiArea.ViewMode.TabbedView)
+    mdiArea.setTabsClosable(True)
+    mdiArea.setTabsMovable(True)
+    for i in range(tabCount):
+        addDocument(mdiArea, i)
+
+    central = QWidget()
+    QVBoxLayout(central).addWidget(mdiArea)
+    window.setCentralWidget(central)
+
+    window.statusBar().addWidget(QLabel("Status"))
+    window.statusBar().addPermanentWidget(QPushButton("Zoom"))
+
+    window.show()
+    app.processEvents()
+    return window
+
+
+def addDocument(mdiArea, index):
+    """Open a (fake) document in the MDI area."""
+    view = QWidget()
+    view.setObjectName(f"view_{index}")
+    subWin = mdiArea.addSubWindow(view)
+    subWin.setWindowTitle(f"Untitled document number {index}.kra")
+    subWin.show()
+    return subWin
+
+
+def applySheets(window, sheets):
+    """Apply a dict of sheets by target, like rebuildStyleSheet does."""
+    window.setStyleSheet(sheets.get('main', ""))
+    window.centralWidget().setStyleSheet(sheets.get('canvas', ""))
+
+    overview = window.findChild(QWidget, 'OverviewDocker')
+    if overview:
+        overview.setStyleSheet(sheets.get('overview', ""))
+
+    toolbox = window.findChild(QWidget, 'ToolBox')
+    if toolbox:
+        toolbox.widget().setStyleSheet(sheets.get('pad', ""))
+
+
+def allWidgets(window):
+    return [window] + window.findChildren(QWidget)
+
+
+def repolish(window):
+    """Unpolish and polish every widget of the window."""
+    for w in allWidgets(window):
+        style = w.style()
+        style.unpolish(w)
+        style.polish(w)
+
+
+def render(window):
+    """Render the whole window to a pixmap."""
+    window.grab()
+
+
+def timeIt(fn, repeat=5):
+    """Run fn `repeat` times and return the median duration in milliseconds."""
+    durations = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        app.processEvents()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(durations)
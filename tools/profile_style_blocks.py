@@ -0,0 +1,122 @@
+"""
+    Plugin for Krita UI Redesign, Copyright (C) 2020 Kapyia, Pedro Reis
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+# Measures what each style block of variables costs to polish and render,
+# on its own and as part of the whole flat theme (by leaving it out), in an
+# offscreen stand-in of Krita's window. Prints the blocks ranked by cost.
+#
+# Applying any sheet to a widget first installs a style sheet style on it
+# and its children, which costs about the same whatever the sheet holds.
+# That cost is reported per target ('install', timed with a rule matching
+# nothing); it dominates and blurs the apply times, so the blocks are ranked
+# by what they add to polishing and rendering. Every measurement is made
+# against a baseline without sheets taken right before it, after a warm-up,
+# so drift over the run doesn't end up in the costs.
+#
+#     python tools/profile_style_blocks.py [number of document tabs, default: 50]
+
+import sys
+import statistics
+from PyQt6.QtWidgets import QWidget
+from offscreen import app, buildMainWindow, applySheets, styleBlocks, flatThemeSheets, repolish, render, timeIt
+
+
+def measure(window, sheets, repeat):
+    """
+    Apply the sheets and return the (apply, polish, render) times in ms.
+    Every apply starts from no sheets, so it doesn't include tearing down
+    the sheets of the previous measurement."""
+    applyTimes = []
+
+    for _ in range(repeat):
+        applySheets(window, {})
+        app.processEvents()
+        applyTimes.append(timeIt(lambda: applySheets(window, sheets), repeat=1))
+
+    applyTime = statistics.median(applyTimes)
+    polishTime = timeIt(lambda: repolish(window), repeat)
+    renderTime = timeIt(lambda: render(window), repeat)
+    return applyTime, polishTime, renderTime
+
+
+def run(tabCount, repeat=5, pairs=3):
+    app.setStyle("Fusion")
+    window = buildMainWindow(tabCount)
+    blocks = styleBlocks()
+    targets = sorted({target for _, _, target in blocks})
+
+    # Warm-up, the first sheets applied are always slower
+    measure(window, flatThemeSheets(), repeat)
+    measure(window, {}, repeat)
+
+    install = {}
+    for target in targets:
+        baseline = measure(window, {}, repeat)
+        empty = measure(window, {target: "QWidget#noSuchWidget { }"}, repeat)
+        install[target] = empty[0] - baseline[0]
+
+    baseline = measure(window, {}, repeat)
+    combined = measure(window, flatThemeSheets(), repeat)
+    combinedCost = sum(combined) - sum(baseline)
+
+    results = []
+    baselineSums = []
+    for name, sheet, target in blocks:
+        # On its own
+        baseline = measure(window, {}, repeat)
+        alone = measure(window, {target: sheet}, repeat)
+        aloneCost = [a - b for a, b in zip(alone, baseline)]
+        baselineSums.append(sum(baseline[1:]))
+
+        # Within the whole theme: what leaving it out saves in polish and
+        # render, the median of a few pairs measured one right after the other
+        sheets = flatThemeSheets()
+        marginal = None
+
+        if f"\n {sheet} \n" in sheets[target]:
+            sheets[target] = sheets[target].replace(f"\n {sheet} \n", "")
+            differences = []
+
+            for _ in range(pairs):
+                withIt = measure(window, flatThemeSheets(), repeat)
+                without = measure(window, sheets, repeat)
+                differences.append(sum(withIt[1:]) - sum(without[1:]))
+
+            marginal = statistics.median(differences)
+
+        results.append((name, target, aloneCost, marginal))
+
+    results.sort(key=lambda r: max(sum(r[2][1:]), r[3] or 0), reverse=True)
+    noise = (max(baselineSums) - min(baselineSums)) / 2
+
+    print(f"{tabCount} document tabs, {len(window.findChildren(QWidget))} widgets, "
+          f"median of {repeat} runs, times in ms relative to no style sheets")
+    print(f"install per target: " + ", ".join(f"{t} {install[t]:.2f}" for t in targets))
+    print(f"whole flat theme adds: {combinedCost:.2f} (incl. install)")
+    print(f"noise, half the spread of the baselines' polish + render: {noise:.2f}\n")
+    print(f"{'rank':<6}{'block':<30}{'target':<10}{'apply':>9}{'polish':>9}{'render':>9}"
+          f"{'alone':>9}{'in theme':>10}")
+    print(f"{'':<46}{'(+install)':>9}{'':>18}{'(polish + render)':>19}")
+
+    for rank, (name, target, (applyCost, polishCost, renderCost), marginal) in enumerate(results, 1):
+        print(f"{rank:<6}{name:<30}{target:<10}{applyCost:>9.2f}{polishCost:>9.2f}{renderCost:>9.2f}"
+              f"{polishCost + renderCost:>9.2f}"
+              f"{'-' if marginal is None else f'{marginal:.2f}':>10}")
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50)